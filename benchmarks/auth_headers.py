@@ -0,0 +1,72 @@
+"""Per-call overhead of auth headers on simulated writes
+
+Times 100k update_booking() calls against a stubbed session, once with the
+headers rebuilt on every call (the implementation before they were cached
+per token) and once with the client's precomputed header mapping.
+
+Run from the repository root:
+
+    python -m benchmarks.auth_headers [writes]
+"""
+
+import sys
+import time
+from datetime import datetime, timedelta
+
+import requests
+
+from helpers.api_client import BookingAPIClient
+
+WRITES = 100_000
+
+
+class PerCallHeadersClient(BookingAPIClient):
+    """update_booking as it was before headers were cached"""
+
+    def update_booking(self, booking_id, booking_data):
+        if not self._is_token_valid():
+            self.authenticate()
+
+        url = f"{self.base_url}/booking/{booking_id}"
+        headers = {
+            "Content-Type": "application/json",
+            "Accept": "application/json",
+            "Cookie": f"token={self.token}",
+            "Authorization": f"Bearer {self.token}",
+        }
+        return self.session.put(url, json=booking_data, headers=headers)
+
+
+def make_client(client_class):
+    client = client_class(auto_refresh=False)
+    client._set_token("0123456789abcdef", datetime.now() + timedelta(hours=1))
+    response = requests.Response()
+    response.status_code = 200
+    client.session.put = lambda url, json=None, headers=None: response
+    return client
+
+
+def time_writes(client, writes):
+    payload = {"firstname": "John"}
+    start = time.perf_counter()
+    for booking_id in range(writes):
+        client.update_booking(booking_id, payload)
+    return time.perf_counter() - start
+
+
+def main(writes=WRITES):
+    for label, client_class in (
+        ("per-call headers", PerCallHeadersClient),
+        ("cached headers", BookingAPIClient),
+    ):
+        client = make_client(client_class)
+        elapsed = time_writes(client, writes)
+        client.close()
+        print(
+            f"{label:>16}: {elapsed * 1000:8.1f} ms for {writes} writes "
+            f"({elapsed / writes * 1e6:.2f} us/call)"
+        )
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else WRITES)
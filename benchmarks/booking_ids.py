@@ -0,0 +1,103 @@
+"""SelfHealing booking ID operations on a large store
+
+Fills a store with 100k IDs and times store, remove, contains and count
+per call. The "list" row replays the original implementation, which kept
+the IDs in a JSON list and scanned it with ``in``/``list.remove``; the
+other rows are the current storage backends.
+
+Run from the repository root:
+
+    python -m benchmarks.booking_ids [ids]
+"""
+
+import json
+import os
+import sys
+import tempfile
+import time
+
+from helpers.storage import BACKENDS
+from helpers.storage.base import BookingRecord
+
+IDS = 100_000
+REPEAT = 20
+
+
+class ListStore:
+    """The JSON list store SelfHealing used before the ID index"""
+
+    def __init__(self, path):
+        self.path = path
+
+    def _load(self):
+        if not os.path.exists(self.path):
+            return {}
+        with open(self.path) as f:
+            return json.load(f)
+
+    def _save(self, data):
+        with open(self.path, "w") as f:
+            json.dump(data, f)
+
+    def store_records(self, records):
+        data = self._load()
+        data["booking_ids"] = [record.booking_id for record in records]
+        self._save(data)
+
+    def store_booking_id(self, booking_id):
+        data = self._load()
+        ids = data.setdefault("booking_ids", [])
+        if booking_id not in ids:
+            ids.append(booking_id)
+        self._save(data)
+
+    def remove_booking_id(self, booking_id):
+        data = self._load()
+        if booking_id in data.get("booking_ids", []):
+            data["booking_ids"].remove(booking_id)
+            self._save(data)
+
+    def contains(self, booking_id):
+        return booking_id in self._load().get("booking_ids", [])
+
+    def count(self):
+        return len(self._load().get("booking_ids", []))
+
+    def close(self):
+        pass
+
+
+def per_call_ms(func, args):
+    start = time.perf_counter()
+    for arg in args:
+        func(arg)
+    return (time.perf_counter() - start) / len(args) * 1000
+
+
+def run(label, store, ids):
+    store.store_records([BookingRecord.new(booking_id) for booking_id in range(ids)])
+    new_ids = range(ids, ids + REPEAT)
+    timings = {
+        "store": per_call_ms(store.store_booking_id, new_ids),
+        "remove": per_call_ms(store.remove_booking_id, new_ids),
+        "contains": per_call_ms(store.contains, range(ids - REPEAT, ids)),
+        "count": per_call_ms(lambda _: store.count(), range(REPEAT)),
+    }
+    store.close()
+    print(
+        f"{label:>8}: "
+        + "  ".join(f"{name} {ms:8.3f} ms" for name, ms in timings.items())
+    )
+
+
+def main(ids=IDS):
+    print(f"Per-call times on a store of {ids} IDs")
+    with tempfile.TemporaryDirectory() as directory:
+        run("list", ListStore(os.path.join(directory, "list.json")), ids)
+        for name, backend_class in BACKENDS.items():
+            path = os.path.join(directory, f"{name}.json")
+            run(name, backend_class(path), ids)
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else IDS)
@@ -0,0 +1,68 @@
+"""BookingAPIClient construction time against a 100k-ID self-healing store
+
+Compares the current constructor, which does no storage I/O, with one that
+also performs the eager restore the client used to run on construction
+(reading the stored token and the full booking ID list).
+
+Run from the repository root:
+
+    python -m benchmarks.client_startup [ids]
+"""
+
+import logging
+import os
+import sys
+import tempfile
+import time
+
+from helpers.api_client import BookingAPIClient
+from helpers.self_healing import SelfHealing
+from helpers.storage.base import BookingRecord
+
+IDS = 100_000
+REPEAT = 20
+
+
+class EagerRestoreClient(BookingAPIClient):
+    """Client that restores self-healing state in __init__, as it used to"""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        stored_token = SelfHealing.get_token()
+        if stored_token:
+            self.token = stored_token
+        stored_booking_ids = SelfHealing.get_booking_ids()
+        if stored_booking_ids:
+            logging.getLogger(__name__).debug(
+                f"Found {len(stored_booking_ids)} booking IDs in self-healing storage"
+            )
+
+
+def per_construction_ms(client_class):
+    start = time.perf_counter()
+    for _ in range(REPEAT):
+        client_class(auto_refresh=False).close()
+    return (time.perf_counter() - start) / REPEAT * 1000
+
+
+def main(ids=IDS):
+    logging.disable(logging.INFO)
+    with tempfile.TemporaryDirectory() as directory:
+        SelfHealing.DATA_FILE = os.path.join(directory, "test_data.json")
+        SelfHealing.WRITE_BACK = False
+        SelfHealing.store_token("0123456789abcdef")
+        backend = SelfHealing._get_backend()
+        backend.store_records(
+            [BookingRecord.new(booking_id) for booking_id in range(ids)]
+        )
+        print(f"Client construction with a {SelfHealing.BACKEND} store of {ids} IDs")
+        for label, client_class in (
+            ("eager restore", EagerRestoreClient),
+            ("lazy restore", BookingAPIClient),
+        ):
+            print(f"{label:>13}: {per_construction_ms(client_class):8.2f} ms")
+        backend.close()
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else IDS)
@@ -1,14 +1,64 @@
 import logging
+import os
 
 import pytest
+import requests
 
 from helpers.api_client import BookingAPIClient
 from helpers.data_generator import DataGenerator
+from helpers.self_healing import SelfHealing
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 
+def pytest_addoption(parser):
+    parser.addoption(
+        "--self-healing-path",
+        default=None,
+        help="File used to store self-healing state (overrides SELF_HEALING_PATH)",
+    )
+
+
+def pytest_configure(config):
+    path = config.getoption("--self-healing-path")
+    if path:
+        SelfHealing.DATA_FILE = path
+        # Propagate to pytest-xdist workers, which re-import SelfHealing
+        os.environ["SELF_HEALING_PATH"] = path
+
+
+def _is_controller(config):
+    """True in the pytest-xdist controller or a run without xdist"""
+    return not hasattr(config, "workerinput")
+
+
+def pytest_sessionstart(session):
+    gc_after = os.getenv("SELF_HEALING_GC_AFTER")
+    if not gc_after or not _is_controller(session.config):
+        return
+    # Remove bookings orphaned by earlier, crashed runs once per session
+    # rather than once per worker
+    with BookingAPIClient() as client:
+        try:
+            client.gc(older_than=float(gc_after))
+        except requests.RequestException as e:
+            logger.warning(f"Garbage collection of orphaned bookings failed: {str(e)}")
+
+
+def pytest_sessionfinish(session):
+    # Only the xdist controller (or a plain run) merges the worker stores
+    if not SelfHealing.SHARD_BY_WORKER or not _is_controller(session.config):
+        return
+    if SelfHealing.merge_worker_shards():
+        # Retry the deletions workers could not complete, from the merged store
+        with BookingAPIClient() as client:
+            try:
+                client.cleanup_test_data(parallel=True)
+            except requests.RequestException as e:
+                logger.warning(f"Cleanup of merged worker stores failed: {str(e)}")
+
+
 @pytest.fixture(scope="session")
 def api_client():
     """Session-scoped API client with authentication"""
@@ -16,7 +66,8 @@ def api_client():
     auth_response = client.authenticate()
     assert auth_response.status_code == 200, "Authentication failed"
     yield client
-    client.cleanup_test_data()
+    client.cleanup_test_data(parallel=True)
+    client.close()
 
 
 @pytest.fixture
@@ -1,37 +1,253 @@
 import logging
 import os
+import re
+import threading
+import weakref
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
 from datetime import datetime, timedelta
-from typing import Any, Dict, Optional
+from types import MappingProxyType
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Mapping,
+    NamedTuple,
+    Optional,
+    Tuple,
+    Union,
+)
+from urllib.parse import urlencode
 
 import requests
 from requests.adapters import HTTPAdapter
 from urllib3.util.retry import Retry
 
+from helpers.response_cache import ResponseCache
 from helpers.self_healing import SelfHealing
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+BOOKING_ID_PATTERN = re.compile(rb'"bookingid"\s*:\s*(\d+)')
+# Sent with request bodies that are already encoded JSON
+JSON_CONTENT_HEADERS: Mapping[str, str] = MappingProxyType(
+    {"Content-Type": "application/json"}
+)
+
+
+def _env_flag(name: str, default: bool) -> bool:
+    """Read a boolean flag from the environment"""
+    value = os.getenv(name)
+    if value is None:
+        return default
+    return value.strip().lower() in ("1", "true", "yes", "on")
+
+
+def _auth_headers(token: str, accept: bool = True) -> Mapping[str, str]:
+    """Build a read-only header set for endpoints that require the auth token"""
+    headers = {"Content-Type": "application/json"}
+    if accept:
+        headers["Accept"] = "application/json"
+    headers["Cookie"] = f"token={token}"
+    headers["Authorization"] = f"Bearer {token}"
+    return MappingProxyType(headers)
+
+
+class PoolMonitoringAdapter(HTTPAdapter):
+    """HTTPAdapter that counts requests in flight through its connection pools"""
+
+    def __init__(self, *args, **kwargs):
+        self._stats_lock = threading.Lock()
+        self.in_flight = 0
+        self.peak_in_flight = 0
+        self.total_requests = 0
+        super().__init__(*args, **kwargs)
+
+    def send(self, request, **kwargs):
+        with self._stats_lock:
+            self.in_flight += 1
+            self.total_requests += 1
+            self.peak_in_flight = max(self.peak_in_flight, self.in_flight)
+        try:
+            return super().send(request, **kwargs)
+        finally:
+            with self._stats_lock:
+                self.in_flight -= 1
+
+
+class BulkResult(NamedTuple):
+    """Outcome of a single item in a bulk operation"""
+
+    item: Any
+    response: Optional[requests.Response]
+    error: Optional[Exception]
+
+    @property
+    def ok(self) -> bool:
+        """True when the request completed with a 2xx status"""
+        return self.error is None and self.response is not None and self.response.ok
+
+
+def _call(func: Callable[[Any], Any], item: Any):
+    """Invoke func, capturing any exception instead of raising it"""
+    try:
+        return func(item), None
+    except Exception as e:
+        return None, e
+
+
+def _map_concurrent(
+    func: Callable[[Any], Any],
+    items: Iterable[Any],
+    max_workers: int,
+    ordered: bool = True,
+) -> Iterator[BulkResult]:
+    """
+    Apply func to items on a thread pool with at most max_workers in flight
+
+    Items are pulled from the iterable lazily, so arbitrarily large inputs
+    never queue more than max_workers requests at once.
+
+    Args:
+        func: Callable invoked once per item
+        items: Items to process
+        max_workers: Maximum number of concurrent calls
+        ordered: Yield results in input order rather than completion order
+
+    Returns:
+        Iterator of BulkResult, one per input item
+    """
+    iterator = iter(items)
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+
+        def submit_next():
+            for item in iterator:
+                return executor.submit(_call, func, item), item
+            return None
+
+        if ordered:
+            window = deque()
+            while len(window) < max_workers and (entry := submit_next()):
+                window.append(entry)
+            while window:
+                future, item = window.popleft()
+                result, error = future.result()
+                entry = submit_next()
+                if entry:
+                    window.append(entry)
+                yield BulkResult(item, result, error)
+        else:
+            in_flight = {}
+            while len(in_flight) < max_workers and (entry := submit_next()):
+                in_flight[entry[0]] = entry[1]
+            while in_flight:
+                done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+                for future in done:
+                    item = in_flight.pop(future)
+                    result, error = future.result()
+                    entry = submit_next()
+                    if entry:
+                        in_flight[entry[0]] = entry[1]
+                    yield BulkResult(item, result, error)
+
+
+def _refresh_if_alive(client_ref: "weakref.ref[BookingAPIClient]") -> None:
+    """Refresh timer target; holds the client weakly so it can still be collected"""
+    client = client_ref()
+    if client is not None:
+        client._refresh_token()
 
-class BookingAPIClient:
-    """Client for interacting with the RESTful Booker API with self-healing capabilities"""
 
-    def __init__(self, username: Optional[str] = None, password: Optional[str] = None):
+class BookingAPIClient:
+    """Client for interacting with the RESTful Booker API with self-healing capabilities
+
+    Use it as a context manager, or call close(), to stop background token
+    refresh and release pooled connections deterministically.
+    """
+
+    # Assume token expires in 1 hour (adjust based on API behavior)
+    TOKEN_TTL = timedelta(hours=1)
+    # Delay before retrying a failed background refresh
+    REFRESH_RETRY_DELAY = 30.0
+    # Booking IDs created by replay_bookings persisted per storage write
+    STORE_BATCH_SIZE = 500
+
+    def __init__(
+        self,
+        username: Optional[str] = None,
+        password: Optional[str] = None,
+        max_workers: Optional[int] = None,
+        pool_connections: Optional[int] = None,
+        pool_maxsize: Optional[int] = None,
+        pool_block: Optional[bool] = None,
+        keep_alive: Optional[bool] = None,
+        auto_refresh: Optional[bool] = None,
+        refresh_margin: Optional[float] = None,
+        cache_ttl: Optional[float] = None,
+        cache_maxsize: Optional[int] = None,
+    ):
         """
         Initialize the API client
 
         Args:
             username: API username (defaults to environment variable)
             password: API password (defaults to environment variable)
+            max_workers: Concurrency limit for bulk operations
+            pool_connections: Number of per-host connection pools to cache
+            pool_maxsize: Connections kept per pool (defaults to max_workers)
+            pool_block: Wait for a free connection instead of opening extras
+            keep_alive: Reuse connections between requests
+            auto_refresh: Renew the token in the background before it expires
+            refresh_margin: Seconds before expiry at which to renew the token
+            cache_ttl: Serve GET responses from a local cache for this many
+                seconds (caching is disabled when unset)
+            cache_maxsize: Maximum number of cached GET responses
         """
         self.base_url = os.getenv("BASE_URL", "https://restful-booker.herokuapp.com")
         self.username = username or os.getenv("API_USERNAME", "admin")
         self.password = password or os.getenv("API_PASSWORD", "password123")
         self.token: Optional[str] = None
         self.token_expiry: Optional[datetime] = None
+        self._write_headers: Mapping[str, str] = MappingProxyType({})
+        self._delete_headers: Mapping[str, str] = MappingProxyType({})
+        self._token_lock = threading.Lock()
+        # Self-healing state is read on first authentication, not here
+        self._state_restored = False
+        # Set for tokens restored without a recorded expiry
+        self._token_unverified = False
+        self._refresh_timer: Optional[threading.Timer] = None
+        # Cancels the pending timer, also when the client is never closed
+        self._refresh_finalizer: Optional[weakref.finalize] = None
+        # Set by close(); stops a refresh in progress from re-arming the timer
+        self._closed = False
+        self.auto_refresh = (
+            auto_refresh
+            if auto_refresh is not None
+            else _env_flag("API_TOKEN_AUTO_REFRESH", True)
+        )
+        self.refresh_margin = (
+            refresh_margin
+            if refresh_margin is not None
+            else float(os.getenv("API_TOKEN_REFRESH_MARGIN", "300"))
+        )
+        self.max_workers = max_workers or int(os.getenv("API_MAX_WORKERS", "10"))
+
+        # Opt-in conditional GET cache for booking reads
+        if cache_ttl is None:
+            cache_ttl = float(os.getenv("API_CACHE_TTL", "0"))
+        self.cache: Optional[ResponseCache] = None
+        if cache_ttl > 0:
+            self.cache = ResponseCache(
+                cache_ttl,
+                cache_maxsize or int(os.getenv("API_CACHE_MAXSIZE", "1024")),
+            )
 
-        # Configure session with retry strategy
+        # Configure session with retry strategy and a pool sized for bulk calls
         self.session = requests.Session()
         retries = Retry(
             total=3,
@@ -39,23 +255,68 @@ class BookingAPIClient:
             status_forcelist=[500, 502, 503, 504],
             allowed_methods=["GET", "POST", "PUT", "DELETE"],
         )
-        self.session.mount("https://", HTTPAdapter(max_retries=retries))
-
-        # Initialize self-healing
-        self._attempt_self_healing()
+        self.adapter = PoolMonitoringAdapter(
+            pool_connections=pool_connections
+            or int(os.getenv("API_POOL_CONNECTIONS", "10")),
+            pool_maxsize=pool_maxsize
+            or int(os.getenv("API_POOL_MAXSIZE", str(self.max_workers))),
+            pool_block=(
+                pool_block
+                if pool_block is not None
+                else _env_flag("API_POOL_BLOCK", False)
+            ),
+            max_retries=retries,
+        )
+        self.session.mount("https://", self.adapter)
+        self.session.mount("http://", self.adapter)
+        if keep_alive is None:
+            keep_alive = _env_flag("API_KEEP_ALIVE", True)
+        if not keep_alive:
+            self.session.headers["Connection"] = "close"
 
     def _attempt_self_healing(self) -> None:
-        """Attempt to recover from previous session state"""
+        """Attempt to recover from previous session state
+
+        Runs once, on the first call to authenticate(), so constructing a
+        client never touches self-healing storage.
+        """
+        self._state_restored = True
         stored_token = SelfHealing.get_token()
         if stored_token:
-            self.token = stored_token
-            logger.info("Recovered token from self-healing storage")
+            stored_expiry = SelfHealing.get_token_expiry()
+            if stored_expiry is None:
+                # Stored by an older version; check it with a probe before use
+                self._set_token(stored_token, None)
+                self._token_unverified = True
+                logger.info("Recovered token from self-healing storage")
+            elif stored_expiry > datetime.now():
+                self._set_token(stored_token, stored_expiry)
+                self._schedule_refresh()
+                logger.info("Recovered unexpired token from self-healing storage")
+
+    def pool_stats(self) -> Dict[str, Any]:
+        """
+        Report connection pool utilisation
 
-        stored_booking_ids = SelfHealing.get_booking_ids()
-        if stored_booking_ids:
-            logger.info(
-                f"Found {len(stored_booking_ids)} booking IDs in self-healing storage"
-            )
+        Returns:
+            Current and peak requests in flight, total requests sent,
+            configured pool size and current utilisation ratio
+        """
+        pool_maxsize = self.adapter._pool_maxsize
+        return {
+            "in_flight": self.adapter.in_flight,
+            "peak_in_flight": self.adapter.peak_in_flight,
+            "total_requests": self.adapter.total_requests,
+            "pool_maxsize": pool_maxsize,
+            "utilisation": self.adapter.in_flight / pool_maxsize,
+        }
+
+    def _set_token(self, token: str, expiry: Optional[datetime]) -> None:
+        """Install a token and the auth headers derived from it"""
+        self._write_headers = _auth_headers(token)
+        self._delete_headers = _auth_headers(token, accept=False)
+        self.token = token
+        self.token_expiry = expiry
 
     def _is_token_valid(self) -> bool:
         """Check if the current token is still valid"""
@@ -63,59 +324,279 @@ class BookingAPIClient:
             return False
         return datetime.now() < self.token_expiry
 
+    def _ensure_token(self) -> None:
+        """Authenticate if there is no valid token"""
+        if not self._is_token_valid():
+            self.authenticate()
+
+    def _existing_token_response(self, token: str) -> requests.Response:
+        """Build a synthetic auth response for a token that is still valid"""
+        logger.info("Using existing valid token")
+        response = requests.Response()
+        response.status_code = 200
+        response._content = b'{"token":"' + token.encode() + b'"}'
+        return response
+
     def authenticate(self) -> requests.Response:
         """
         Authenticate and store token
 
+        Safe to call from many threads: only one /auth request is in flight
+        at a time and threads waiting on it reuse the token it obtains.
+
         Returns:
             Response from authentication endpoint
         """
-        url = f"{self.base_url}/auth"
-        data = {"username": self.username, "password": self.password}
-
         # Try to use self-healing token first if available
+        token = self.token
         if self._is_token_valid():
-            logger.info("Using existing valid token")
-            response = requests.Response()
-            response.status_code = 200
-            response._content = b'{"token":"' + self.token.encode() + b'"}'
-            return response
+            return self._existing_token_response(token)
+
+        with self._token_lock:
+            if not self._state_restored:
+                self._attempt_self_healing()
+
+            # Another thread may have refreshed while we waited for the lock
+            token = self.token
+            if self._is_token_valid():
+                return self._existing_token_response(token)
+
+            if self._token_unverified:
+                self._token_unverified = False
+                if self.validate_token(token):
+                    self._set_token(token, datetime.now() + self.TOKEN_TTL)
+                    self._schedule_refresh()
+                    return self._existing_token_response(token)
+            return self._request_token()
+
+    def validate_token(self, token: Optional[str] = None) -> bool:
+        """
+        Check with the server whether a token is accepted, without /auth
 
+        Sends an empty PATCH for a booking ID that never exists: the API
+        answers 403 for a rejected token and 404/405 for an accepted one,
+        so no credentials are checked and no token is issued or stored.
+
+        Args:
+            token: Token to check (defaults to the current token)
+
+        Returns:
+            True if the server accepted the token
+        """
+        token = token or self.token
+        if not token:
+            return False
+        url = f"{self.base_url}/booking/0"
+        try:
+            response = self.session.patch(url, json={}, headers=_auth_headers(token))
+        except requests.RequestException as e:
+            logger.warning(f"Token validation probe failed: {str(e)}")
+            return False
+        return response.status_code in (200, 404, 405)
+
+    def _request_token(self) -> requests.Response:
+        """Call /auth and install the new token; caller must hold the token lock"""
+        url = f"{self.base_url}/auth"
+        data = {"username": self.username, "password": self.password}
         response = self.session.post(url, json=data)
 
         if response.status_code == 200:
-            self.token = response.json().get("token")
-            if self.token:
-                # Assume token expires in 1 hour (adjust based on API behavior)
-                self.token_expiry = datetime.now() + timedelta(hours=1)
-                SelfHealing.store_token(self.token)
+            token = response.json().get("token")
+            if token:
+                self._set_token(token, datetime.now() + self.TOKEN_TTL)
+                SelfHealing.store_token(token, self.token_expiry)
                 logger.info("Successfully authenticated and stored token")
+                self._schedule_refresh()
             else:
                 logger.warning("Authentication succeeded but no token received")
 
         return response
 
-    def create_booking(self, booking_data: Dict[str, Any]) -> requests.Response:
+    def _schedule_refresh(self, delay: Optional[float] = None) -> None:
+        """Arm the background timer that renews the token ahead of expiry
+
+        Callers must hold the token lock.
+        """
+        if self._closed or not self.auto_refresh or not self.token_expiry:
+            return
+        if delay is None:
+            remaining = (self.token_expiry - datetime.now()).total_seconds()
+            delay = max(0.0, remaining - self.refresh_margin)
+
+        self._cancel_refresh()
+        timer = threading.Timer(delay, _refresh_if_alive, args=(weakref.ref(self),))
+        timer.daemon = True
+        self._refresh_finalizer = weakref.finalize(self, timer.cancel)
+        self._refresh_timer = timer
+        timer.start()
+
+    def _cancel_refresh(self) -> None:
+        """Cancel the pending refresh timer, if any"""
+        if self._refresh_finalizer is not None:
+            # Calling the finalizer cancels the timer and detaches it
+            self._refresh_finalizer()
+            self._refresh_finalizer = None
+        self._refresh_timer = None
+
+    def _refresh_token(self) -> None:
+        """Renew the token from the background timer"""
+        with self._token_lock:
+            previous_expiry = self.token_expiry
+            try:
+                response = self._request_token()
+            except requests.RequestException as e:
+                logger.warning(f"Background token refresh failed: {str(e)}")
+            else:
+                if self.token_expiry != previous_expiry:
+                    logger.info("Refreshed token ahead of expiry")
+                    return
+                logger.warning(
+                    f"Background token refresh failed: HTTP {response.status_code}"
+                )
+
+            # Keep trying while the current token is still usable; once it
+            # lapses, writes fall back to authenticating on demand.
+            if self._is_token_valid():
+                self._schedule_refresh(self.REFRESH_RETRY_DELAY)
+
+    def close(self) -> None:
+        """Stop background token refresh and release pooled connections"""
+        # Waits for a refresh in progress, which then cannot re-arm the timer
+        with self._token_lock:
+            self._closed = True
+            self._cancel_refresh()
+        self.session.close()
+
+    def __enter__(self) -> "BookingAPIClient":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def create_booking(
+        self, booking_data: Union[Dict[str, Any], bytes]
+    ) -> requests.Response:
         """
         Create a new booking
 
         Args:
-            booking_data: Dictionary containing booking details
+            booking_data: Dictionary containing booking details, or the same
+                already encoded as JSON bytes, which is sent as-is
 
         Returns:
             Response from booking creation endpoint
         """
-        url = f"{self.base_url}/booking"
-        response = self.session.post(url, json=booking_data)
+        response = self._send_create(booking_data)
 
-        if response.status_code == 200:
-            booking_id = response.json().get("bookingid")
-            if booking_id:
-                SelfHealing.store_booking_id(booking_id)
-                logger.info(f"Stored booking ID {booking_id} for self-healing")
+        booking_id = self._created_booking_id(response)
+        if booking_id:
+            SelfHealing.store_booking_id(booking_id)
+            logger.info(f"Stored booking ID {booking_id} for self-healing")
+
+        return response
 
+    def _send_create(
+        self, booking_data: Union[Dict[str, Any], bytes]
+    ) -> requests.Response:
+        """Issue the POST request without touching self-healing storage"""
+        url = f"{self.base_url}/booking"
+        if isinstance(booking_data, bytes):
+            response = self.session.post(
+                url, data=booking_data, headers=JSON_CONTENT_HEADERS
+            )
+        else:
+            response = self.session.post(url, json=booking_data)
+
+        if response.status_code == 200 and self.cache is not None:
+            # New bookings only change listings, not cached single reads
+            self.cache.invalidate(url)
+            self.cache.invalidate_prefix(f"{url}?")
         return response
 
+    @staticmethod
+    def _created_booking_id(response: Optional[requests.Response]) -> Optional[int]:
+        """Booking ID reported by a successful creation response, if any"""
+        if response is None or response.status_code != 200:
+            return None
+        try:
+            return response.json().get("bookingid")
+        except ValueError:
+            return None
+
+    def create_bookings(
+        self,
+        bookings: Iterable[Union[Dict[str, Any], bytes]],
+        max_workers: Optional[int] = None,
+    ) -> List[BulkResult]:
+        """
+        Create many bookings concurrently
+
+        The created IDs are recorded for self-healing in one storage write.
+
+        Args:
+            bookings: Iterable of booking payloads
+            max_workers: Maximum requests in flight (defaults to client setting)
+
+        Returns:
+            One BulkResult per payload, in input order
+        """
+        results = list(
+            _map_concurrent(
+                self._send_create, bookings, max_workers or self.max_workers
+            )
+        )
+        created = [
+            booking_id
+            for result in results
+            if (booking_id := self._created_booking_id(result.response))
+        ]
+        if created:
+            SelfHealing.store_booking_ids(created)
+            logger.info(f"Stored {len(created)} booking IDs for self-healing")
+        failed = sum(1 for result in results if not result.ok)
+        if failed:
+            logger.warning(f"{failed} of {len(results)} booking creations failed")
+        return results
+
+    def replay_bookings(
+        self,
+        bookings: Iterable[Union[Dict[str, Any], bytes]],
+        max_workers: Optional[int] = None,
+        ordered: bool = False,
+    ) -> Iterator[BulkResult]:
+        """
+        Stream payloads into create_booking without materialising them
+
+        Unlike create_bookings, payloads are consumed lazily and results are
+        yielded as they arrive, so datasets such as
+        DataGenerator.load_bookings(path) of any size can be replayed.
+        Created IDs are recorded for self-healing every STORE_BATCH_SIZE
+        bookings and when the iterator is exhausted or closed.
+
+        Args:
+            bookings: Iterable of booking payloads
+            max_workers: Maximum requests in flight (defaults to client setting)
+            ordered: Yield results in input order rather than completion order
+
+        Returns:
+            Iterator of BulkResult, one per payload
+        """
+        created: List[int] = []
+        try:
+            for result in _map_concurrent(
+                self._send_create, bookings, max_workers or self.max_workers, ordered
+            ):
+                booking_id = self._created_booking_id(result.response)
+                if booking_id:
+                    created.append(booking_id)
+                    if len(created) >= self.STORE_BATCH_SIZE:
+                        SelfHealing.store_booking_ids(created)
+                        created = []
+                yield result
+        finally:
+            if created:
+                SelfHealing.store_booking_ids(created)
+
     def get_booking(self, booking_id: int) -> requests.Response:
         """
         Get booking by ID
@@ -127,17 +608,156 @@ class BookingAPIClient:
             Response from booking retrieval endpoint
         """
         url = f"{self.base_url}/booking/{booking_id}"
-        return self.session.get(url)
+        return self._cached_get(url)
+
+    def get_bookings(
+        self,
+        booking_ids: Iterable[int],
+        max_workers: Optional[int] = None,
+        ordered: bool = True,
+    ) -> Iterator[Tuple[int, Optional[Dict[str, Any]]]]:
+        """
+        Fetch many bookings concurrently over the pooled session
+
+        Repeated IDs are fetched once. Bookings that could not be retrieved
+        are yielded with None in place of the booking.
+
+        Args:
+            booking_ids: IDs of the bookings to retrieve
+            max_workers: Maximum requests in flight (defaults to client setting)
+            ordered: Yield in input order rather than as requests complete
 
-    def get_all_bookings(self) -> requests.Response:
+        Returns:
+            Iterator of (booking_id, booking) pairs
         """
-        Get all bookings
+
+        def unique(ids):
+            seen = set()
+            for booking_id in ids:
+                if booking_id not in seen:
+                    seen.add(booking_id)
+                    yield booking_id
+
+        for result in _map_concurrent(
+            self.get_booking,
+            unique(booking_ids),
+            max_workers or self.max_workers,
+            ordered=ordered,
+        ):
+            if result.ok:
+                yield result.item, result.response.json()
+                continue
+            reason = result.error or f"HTTP {result.response.status_code}"
+            logger.warning(f"Failed to fetch booking {result.item}: {reason}")
+            yield result.item, None
+
+    def get_all_bookings(
+        self,
+        firstname: Optional[str] = None,
+        lastname: Optional[str] = None,
+        checkin: Optional[str] = None,
+        checkout: Optional[str] = None,
+    ) -> requests.Response:
+        """
+        Get all bookings, optionally filtered by name or dates
+
+        Args:
+            firstname: Only return bookings with this first name
+            lastname: Only return bookings with this last name
+            checkin: Only return bookings checking in on or after this date
+            checkout: Only return bookings checking out on or after this date
 
         Returns:
             Response from bookings endpoint
         """
+        url = self._bookings_url(firstname, lastname, checkin, checkout)
+        return self._cached_get(url)
+
+    def iter_booking_ids(
+        self,
+        firstname: Optional[str] = None,
+        lastname: Optional[str] = None,
+        checkin: Optional[str] = None,
+        checkout: Optional[str] = None,
+        chunk_size: int = 65536,
+    ) -> Iterator[int]:
+        """
+        Stream booking IDs from the bookings endpoint without loading the body
+
+        Accepts the same filters as get_all_bookings. Memory use is bounded by
+        chunk_size regardless of how many bookings the server returns.
+
+        Args:
+            firstname: Only return bookings with this first name
+            lastname: Only return bookings with this last name
+            checkin: Only return bookings checking in on or after this date
+            checkout: Only return bookings checking out on or after this date
+            chunk_size: Bytes read from the socket at a time
+
+        Returns:
+            Iterator of booking IDs in response order
+        """
+        url = self._bookings_url(firstname, lastname, checkin, checkout)
+        with self.session.get(url, stream=True) as response:
+            response.raise_for_status()
+            buffer = b""
+            for chunk in response.iter_content(chunk_size=chunk_size):
+                buffer += chunk
+                consumed = 0
+                for match in BOOKING_ID_PATTERN.finditer(buffer):
+                    if match.end() == len(buffer):
+                        # The digits may continue in the next chunk
+                        break
+                    yield int(match.group(1))
+                    consumed = match.end()
+                # Keep only enough of the tail to complete a split match
+                buffer = buffer[max(consumed, len(buffer) - 64) :]
+            for match in BOOKING_ID_PATTERN.finditer(buffer):
+                yield int(match.group(1))
+
+    def _bookings_url(self, firstname, lastname, checkin, checkout) -> str:
+        """Build the bookings collection URL with any filters applied"""
         url = f"{self.base_url}/booking"
-        return self.session.get(url)
+        params = {
+            name: value
+            for name, value in (
+                ("firstname", firstname),
+                ("lastname", lastname),
+                ("checkin", checkin),
+                ("checkout", checkout),
+            )
+            if value is not None
+        }
+        return f"{url}?{urlencode(params)}" if params else url
+
+    def _cached_get(self, url: str) -> requests.Response:
+        """GET through the response cache, revalidating stale entries"""
+        if self.cache is None:
+            return self.session.get(url)
+
+        entry = self.cache.get(url)
+        if entry is not None and self.cache.is_fresh(entry):
+            return entry.response
+
+        headers = entry.conditional_headers() if entry is not None else {}
+        response = self.session.get(url, headers=headers or None)
+
+        if response.status_code == 304 and entry is not None:
+            self.cache.touch(url)
+            return entry.response
+        if response.status_code == 200:
+            self.cache.put(url, response)
+        else:
+            self.cache.invalidate(url)
+        return response
+
+    def _invalidate_booking(self, booking_id: int) -> None:
+        """Drop cached reads that a write to booking_id makes stale"""
+        if self.cache is not None:
+            self.cache.invalidate(f"{self.base_url}/booking/{booking_id}")
+            # Filtered listings may include this booking too
+            self.cache.invalidate_prefix(f"{self.base_url}/booking?")
+            self.cache.invalidate(f"{self.base_url}/booking")
 
     def update_booking(
         self, booking_id: int, booking_data: Dict[str, Any]
@@ -152,17 +772,11 @@ class BookingAPIClient:
         Returns:
             Response from booking update endpoint
         """
-        if not self._is_token_valid():
-            self.authenticate()
-
+        self._ensure_token()
         url = f"{self.base_url}/booking/{booking_id}"
-        headers = {
-            "Content-Type": "application/json",
-            "Accept": "application/json",
-            "Cookie": f"token={self.token}",
-            "Authorization": f"Bearer {self.token}",
-        }
-        return self.session.put(url, json=booking_data, headers=headers)
+        response = self.session.put(url, json=booking_data, headers=self._write_headers)
+        self._invalidate_booking(booking_id)
+        return response
 
     def partial_update_booking(
         self, booking_id: int, update_fields: Dict[str, Any]
@@ -177,17 +791,13 @@ class BookingAPIClient:
         Returns:
             Response from booking update endpoint
         """
-        if not self._is_token_valid():
-            self.authenticate()
-
+        self._ensure_token()
         url = f"{self.base_url}/booking/{booking_id}"
-        headers = {
-            "Content-Type": "application/json",
-            "Accept": "application/json",
-            "Cookie": f"token={self.token}",
-            "Authorization": f"Bearer {self.token}",
-        }
-        return self.session.patch(url, json=update_fields, headers=headers)
+        response = self.session.patch(
+            url, json=update_fields, headers=self._write_headers
+        )
+        self._invalidate_booking(booking_id)
+        return response
 
     def delete_booking(self, booking_id: int) -> requests.Response:
         """
@@ -199,16 +809,7 @@ class BookingAPIClient:
         Returns:
             Response from booking deletion endpoint
         """
-        if not self._is_token_valid():
-            self.authenticate()
-
-        url = f"{self.base_url}/booking/{booking_id}"
-        headers = {
-            "Content-Type": "application/json",
-            "Cookie": f"token={self.token}",
-            "Authorization": f"Bearer {self.token}",
-        }
-        response = self.session.delete(url, headers=headers)
+        response = self._send_delete(booking_id)
 
         if response.status_code == 201:
             SelfHealing.remove_booking_id(booking_id)
@@ -216,6 +817,54 @@ class BookingAPIClient:
 
         return response
 
+    def _send_delete(self, booking_id: int) -> requests.Response:
+        """Issue the DELETE request without touching self-healing storage"""
+        self._ensure_token()
+        url = f"{self.base_url}/booking/{booking_id}"
+        response = self.session.delete(url, headers=self._delete_headers)
+        self._invalidate_booking(booking_id)
+        return response
+
+    def _delete_many(
+        self, booking_ids: Iterable[int], max_workers: Optional[int] = None
+    ) -> List[BulkResult]:
+        """Delete bookings concurrently, leaving storage updates to the caller"""
+        # Authenticate up front so workers don't each trip token expiry
+        self._ensure_token()
+
+        return list(
+            _map_concurrent(
+                self._send_delete, booking_ids, max_workers or self.max_workers
+            )
+        )
+
+    def delete_bookings(
+        self, booking_ids: Iterable[int], max_workers: Optional[int] = None
+    ) -> List[BulkResult]:
+        """
+        Delete many bookings concurrently
+
+        Args:
+            booking_ids: IDs of the bookings to delete
+            max_workers: Maximum requests in flight (defaults to client setting)
+
+        Returns:
+            One BulkResult per ID, in input order
+        """
+        results = self._delete_many(booking_ids, max_workers)
+
+        deleted = [
+            result.item
+            for result in results
+            if result.response is not None and result.response.status_code == 201
+        ]
+        if deleted:
+            SelfHealing.remove_booking_ids(deleted)
+        failed = len(results) - len(deleted)
+        if failed:
+            logger.warning(f"{failed} of {len(results)} booking deletions failed")
+        return results
+
     def health_check(self) -> requests.Response:
         """
         Perform a health check on the API
@@ -226,16 +875,96 @@ class BookingAPIClient:
         url = f"{self.base_url}/ping"
         return self.session.get(url)
 
-    def cleanup_test_data(self):
+    def cleanup_test_data(
+        self, parallel: bool = False, max_workers: Optional[int] = None
+    ) -> Dict[str, List[int]]:
         """
         Clean up any test data that was created
+
+        In parallel mode deletions run concurrently and the self-healing
+        store is updated once at the end; IDs that failed to delete are kept
+        so a later run can retry them.
+
+        Args:
+            parallel: Delete concurrently instead of one ID at a time
+            max_workers: Maximum requests in flight in parallel mode
+
+        Returns:
+            Booking IDs grouped into "deleted", "already_gone" and "failed"
         """
-        booking_ids = SelfHealing.get_booking_ids()
-        for booking_id in booking_ids:
-            try:
-                self.delete_booking(booking_id)
-            except Exception as e:
-                logger.warning(f"Failed to delete booking {booking_id}: {str(e)}")
+        booking_ids = SelfHealing.iter_booking_ids()
+
+        if parallel:
+            summary = self._delete_and_forget(booking_ids, max_workers)
+        else:
+            summary = {"deleted": [], "already_gone": [], "failed": []}
+            for booking_id in booking_ids:
+                result = BulkResult(booking_id, *_call(self.delete_booking, booking_id))
+                summary[self._deletion_outcome(result)].append(booking_id)
+            SelfHealing.cleanup_test_data()
+
+        logger.info(
+            f"Cleaned up test data: {len(summary['deleted'])} deleted, "
+            f"{len(summary['already_gone'])} already gone, "
+            f"{len(summary['failed'])} failed"
+        )
+        return summary
+
+    def gc(
+        self, older_than: Union[timedelta, float], max_workers: Optional[int] = None
+    ) -> Dict[str, List[int]]:
+        """
+        Delete bookings orphaned by earlier runs
 
-        SelfHealing.cleanup_test_data()
-        logger.info("Cleaned up all test data")
+        Targets stored IDs created by a different run more than older_than
+        ago, which the run that created them failed to clean up. Bookings
+        from the current run are never touched.
+
+        Args:
+            older_than: Minimum age as a timedelta or a number of seconds
+            max_workers: Maximum requests in flight
+
+        Returns:
+            Booking IDs grouped into "deleted", "already_gone" and "failed"
+        """
+        stale_ids = SelfHealing.get_stale_booking_ids(older_than)
+        if not stale_ids:
+            return {"deleted": [], "already_gone": [], "failed": []}
+
+        summary = self._delete_and_forget(stale_ids, max_workers)
+        logger.info(
+            f"Garbage-collected orphaned bookings: {len(summary['deleted'])} "
+            f"deleted, {len(summary['already_gone'])} already gone, "
+            f"{len(summary['failed'])} failed"
+        )
+        return summary
+
+    def _delete_and_forget(
+        self, booking_ids: Iterable[int], max_workers: Optional[int]
+    ) -> Dict[str, List[int]]:
+        """Delete concurrently, then drop resolved IDs from storage in one write"""
+        summary: Dict[str, List[int]] = {
+            "deleted": [],
+            "already_gone": [],
+            "failed": [],
+        }
+        for result in self._delete_many(booking_ids, max_workers):
+            summary[self._deletion_outcome(result)].append(result.item)
+        SelfHealing.remove_booking_ids(summary["deleted"] + summary["already_gone"])
+        return summary
+
+    @staticmethod
+    def _deletion_outcome(result: BulkResult) -> str:
+        """Classify a delete result for the cleanup summary"""
+        if result.error is not None:
+            logger.warning(f"Failed to delete booking {result.item}: {result.error}")
+            return "failed"
+        if result.response.status_code == 201:
+            return "deleted"
+        if result.response.status_code in (404, 405):
+            return "already_gone"
+        logger.warning(
+            f"Failed to delete booking {result.item}: "
+            f"HTTP {result.response.status_code}"
+        )
+        return "failed"
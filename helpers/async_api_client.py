@@ -0,0 +1,287 @@
+import asyncio
+import logging
+import os
+from datetime import datetime, timedelta
+from types import MappingProxyType
+from typing import Any, Dict, Mapping, Optional, Union
+
+import httpx
+
+from helpers.api_client import JSON_CONTENT_HEADERS
+from helpers.self_healing import SelfHealing
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+RETRY_STATUSES = frozenset({500, 502, 503, 504})
+
+
+class AsyncBookingAPIClient:
+    """Asyncio client for the RESTful Booker API sharing one pooled connection set"""
+
+    def __init__(
+        self,
+        username: Optional[str] = None,
+        password: Optional[str] = None,
+        max_connections: Optional[int] = None,
+        max_keepalive_connections: Optional[int] = None,
+        retries: int = 3,
+        backoff_factor: float = 1,
+    ):
+        """
+        Initialize the async API client
+
+        Args:
+            username: API username (defaults to environment variable)
+            password: API password (defaults to environment variable)
+            max_connections: Upper bound on concurrent connections in the pool
+            max_keepalive_connections: Idle connections kept open for reuse
+            retries: Retry attempts for 5xx responses and transport errors
+            backoff_factor: Base delay in seconds between retries
+        """
+        self.base_url = os.getenv("BASE_URL", "https://restful-booker.herokuapp.com")
+        self.username = username or os.getenv("API_USERNAME", "admin")
+        self.password = password or os.getenv("API_PASSWORD", "password123")
+        self.token: Optional[str] = None
+        self.token_expiry: Optional[datetime] = None
+        self._write_headers: Mapping[str, str] = MappingProxyType({})
+        self._delete_headers: Mapping[str, str] = MappingProxyType({})
+        self.retries = retries
+        self.backoff_factor = backoff_factor
+
+        max_connections = max_connections or int(
+            os.getenv("API_ASYNC_MAX_CONNECTIONS", "100")
+        )
+        limits = httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_keepalive_connections or max_connections,
+        )
+        self.client = httpx.AsyncClient(base_url=self.base_url, limits=limits)
+        self._auth_lock = asyncio.Lock()
+        self._state_restored = False
+
+    def _attempt_self_healing(self) -> None:
+        """Recover an unexpired token on first authentication
+
+        Reads self-healing storage, so callers run it off the event loop.
+        """
+        self._state_restored = True
+        stored_token = SelfHealing.get_token()
+        if not stored_token:
+            return
+        stored_expiry = SelfHealing.get_token_expiry()
+        if stored_expiry and stored_expiry > datetime.now():
+            self._set_token(stored_token, stored_expiry)
+            logger.info("Recovered unexpired token from self-healing storage")
+
+    async def __aenter__(self) -> "AsyncBookingAPIClient":
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.aclose()
+
+    async def aclose(self) -> None:
+        """Close the underlying connection pool"""
+        await self.client.aclose()
+
+    def _is_token_valid(self) -> bool:
+        """Check if the current token is still valid"""
+        if not self.token or not self.token_expiry:
+            return False
+        return datetime.now() < self.token_expiry
+
+    def _set_token(self, token: str, expiry: Optional[datetime]) -> None:
+        """Install a token and precompute the auth headers derived from it"""
+        auth = {"Cookie": f"token={token}", "Authorization": f"Bearer {token}"}
+        self._write_headers = MappingProxyType(
+            {"Content-Type": "application/json", "Accept": "application/json", **auth}
+        )
+        self._delete_headers = MappingProxyType(
+            {"Content-Type": "application/json", **auth}
+        )
+        self.token = token
+        self.token_expiry = expiry
+
+    async def _request(self, method: str, path: str, **kwargs) -> httpx.Response:
+        """Send a request, retrying transient failures with exponential backoff"""
+        attempt = 0
+        while True:
+            try:
+                response = await self.client.request(method, path, **kwargs)
+            except httpx.TransportError:
+                if attempt >= self.retries:
+                    raise
+            else:
+                if (
+                    response.status_code not in RETRY_STATUSES
+                    or attempt >= self.retries
+                ):
+                    return response
+            await asyncio.sleep(self.backoff_factor * (2**attempt))
+            attempt += 1
+
+    async def authenticate(self) -> httpx.Response:
+        """
+        Authenticate and store token
+
+        Concurrent callers share a single in-flight /auth request.
+
+        Returns:
+            Response from authentication endpoint
+        """
+        async with self._auth_lock:
+            if not self._state_restored:
+                await asyncio.to_thread(self._attempt_self_healing)
+
+            if self._is_token_valid():
+                logger.info("Using existing valid token")
+                return httpx.Response(200, json={"token": self.token})
+
+            data = {"username": self.username, "password": self.password}
+            response = await self._request("POST", "/auth", json=data)
+
+            if response.status_code == 200:
+                token = response.json().get("token")
+                if token:
+                    # Assume token expires in 1 hour (adjust based on API behavior)
+                    self._set_token(token, datetime.now() + timedelta(hours=1))
+                    await asyncio.to_thread(
+                        SelfHealing.store_token, token, self.token_expiry
+                    )
+                    logger.info("Successfully authenticated and stored token")
+                else:
+                    logger.warning("Authentication succeeded but no token received")
+
+            return response
+
+    async def create_booking(
+        self, booking_data: Union[Dict[str, Any], bytes]
+    ) -> httpx.Response:
+        """
+        Create a new booking
+
+        Args:
+            booking_data: Dictionary containing booking details, or the same
+                already encoded as JSON bytes, which is sent as-is
+
+        Returns:
+            Response from booking creation endpoint
+        """
+        if isinstance(booking_data, bytes):
+            response = await self._request(
+                "POST", "/booking", content=booking_data, headers=JSON_CONTENT_HEADERS
+            )
+        else:
+            response = await self._request("POST", "/booking", json=booking_data)
+
+        if response.status_code == 200:
+            booking_id = response.json().get("bookingid")
+            if booking_id:
+                # SelfHealing does blocking file I/O under its own locks, so
+                # keep it off the event loop
+                await asyncio.to_thread(SelfHealing.store_booking_id, booking_id)
+                logger.info(f"Stored booking ID {booking_id} for self-healing")
+
+        return response
+
+    async def get_booking(self, booking_id: int) -> httpx.Response:
+        """
+        Get booking by ID
+
+        Args:
+            booking_id: ID of the booking to retrieve
+
+        Returns:
+            Response from booking retrieval endpoint
+        """
+        return await self._request("GET", f"/booking/{booking_id}")
+
+    async def get_all_bookings(self) -> httpx.Response:
+        """
+        Get all bookings
+
+        Returns:
+            Response from bookings endpoint
+        """
+        return await self._request("GET", "/booking")
+
+    async def update_booking(
+        self, booking_id: int, booking_data: Dict[str, Any]
+    ) -> httpx.Response:
+        """
+        Update an existing booking
+
+        Args:
+            booking_id: ID of the booking to update
+            booking_data: Dictionary containing updated booking details
+
+        Returns:
+            Response from booking update endpoint
+        """
+        if not self._is_token_valid():
+            await self.authenticate()
+
+        return await self._request(
+            "PUT",
+            f"/booking/{booking_id}",
+            json=booking_data,
+            headers=self._write_headers,
+        )
+
+    async def partial_update_booking(
+        self, booking_id: int, update_fields: Dict[str, Any]
+    ) -> httpx.Response:
+        """
+        Partially update a booking (PATCH)
+
+        Args:
+            booking_id: ID of the booking to update
+            update_fields: Dictionary containing fields to update
+
+        Returns:
+            Response from booking update endpoint
+        """
+        if not self._is_token_valid():
+            await self.authenticate()
+
+        return await self._request(
+            "PATCH",
+            f"/booking/{booking_id}",
+            json=update_fields,
+            headers=self._write_headers,
+        )
+
+    async def delete_booking(self, booking_id: int) -> httpx.Response:
+        """
+        Delete a booking
+
+        Args:
+            booking_id: ID of the booking to delete
+
+        Returns:
+            Response from booking deletion endpoint
+        """
+        if not self._is_token_valid():
+            await self.authenticate()
+
+        response = await self._request(
+            "DELETE",
+            f"/booking/{booking_id}",
+            headers=self._delete_headers,
+        )
+
+        if response.status_code == 201:
+            await asyncio.to_thread(SelfHealing.remove_booking_id, booking_id)
+            logger.info(f"Removed booking ID {booking_id} from self-healing storage")
+
+        return response
+
+    async def health_check(self) -> httpx.Response:
+        """
+        Perform a health check on the API
+
+        Returns:
+            Response from ping endpoint
+        """
+        return await self._request("GET", "/ping")
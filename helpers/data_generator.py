@@ -1,86 +1,403 @@
+import contextlib
+import functools
+import gzip
+import json
+import os
 import random
 import string
-from datetime import datetime, timedelta
+import threading
+from collections import Counter
+from datetime import date, datetime, timedelta
+from itertools import repeat
+
+try:
+    import orjson
+except ImportError:  # optional, speeds up payload encoding
+    orjson = None
+
+# Ranges used by generate_bookings
+PRICE_RANGE = (100, 1000)
+CHECKIN_DAYS_RANGE = (1, 365)
+MAX_NIGHTS = 14
+
+DEFAULT_NAME = ("John", "Doe")
+DEFAULT_NEEDS = "Breakfast"
+ADDITIONAL_NEEDS = (
+    "Breakfast",
+    "Breakfast and dinner",
+    "Late checkout",
+    "Early check-in",
+    "Airport transfer",
+    "Parking",
+    "Extra bed",
+    "Baby cot",
+    "Sea view",
+)
+
+# Seeding mutates a Faker instance, so pool generation is serialised
+_faker_lock = threading.Lock()
+
+
+@functools.lru_cache(maxsize=None)
+def _faker(locale):
+    """Faker instance for a locale, created once per process"""
+    # Imported here so generators without locales don't pay for loading Faker
+    from faker import Faker
+
+    return Faker(locale)
+
+
+def encode_json(record):
+    """Serialise a record to compact UTF-8 JSON bytes, using orjson if present"""
+    if orjson is not None:
+        return orjson.dumps(record)
+    return json.dumps(record, separators=(",", ":"), ensure_ascii=False).encode()
+
+
+def _open_dataset(path, mode, compress):
+    """Open a JSONL dataset in binary mode, optionally through gzip"""
+    if compress:
+        return gzip.open(path, mode + "b")
+    return open(path, mode + "b")
+
+
+def write_jsonl(path, records):
+    """
+    Stream records to a JSONL file, one JSON document per line
+
+    The file is written under a temporary name and moved into place once
+    complete, so an interrupted export never leaves a truncated dataset.
+
+    Args:
+        path: Destination file; a .gz suffix enables gzip compression
+        records: Iterable of JSON-serialisable records or encoded bytes
+
+    Returns:
+        Number of records written
+    """
+    path = os.fspath(path)
+    tmp_path = f"{path}.tmp"
+    count = 0
+    try:
+        with _open_dataset(tmp_path, "w", path.endswith(".gz")) as f:
+            for record in records:
+                if not isinstance(record, bytes):
+                    record = encode_json(record)
+                f.write(record)
+                f.write(b"\n")
+                count += 1
+    except BaseException:
+        # The open itself may have failed, leaving nothing to remove
+        with contextlib.suppress(FileNotFoundError):
+            os.remove(tmp_path)
+        raise
+    os.replace(tmp_path, path)
+    return count
+
+
+def read_jsonl(path, encoded=False):
+    """
+    Lazily yield the records of a JSONL file written by write_jsonl
+
+    Args:
+        path: Dataset file; a .gz suffix means it is gzip-compressed
+        encoded: Yield each line as JSON bytes instead of decoding it
+    """
+    loads = orjson.loads if orjson is not None else json.loads
+    with _open_dataset(path, "r", os.fspath(path).endswith(".gz")) as f:
+        for line in f:
+            line = line.rstrip()
+            if line:
+                yield line if encoded else loads(line)
+
+
+class _default_bound:
+    """Method decorator that binds class-level calls to a shared instance
+
+    Keeps DataGenerator.generate_valid_booking_data() working next to
+    DataGenerator(seed=42).generate_valid_booking_data().
+    """
+
+    def __init__(self, func):
+        self.func = func
+        functools.update_wrapper(self, func)
+
+    def __get__(self, instance, owner):
+        if instance is None:
+            instance = owner.default()
+        return self.func.__get__(instance, owner)
 
 
 class DataGenerator:
-    """Helper class for generating test data."""
+    """Helper class for generating test data.
+
+    Instances own their RNG and clock, so a generator built with the same
+    seed and clock produces the same payloads on every run. Calling the
+    methods on the class uses a shared, unseeded instance.
+    """
+
+    _defaults = {}
+    _defaults_lock = threading.Lock()
+
+    def __init__(self, seed=None, clock=None, locales=None, name_pool_size=None):
+        """
+        Initialize the generator
+
+        Args:
+            seed: Seed for the generator's private RNG
+            clock: Callable returning the current datetime, or a fixed
+                date/datetime that booking dates are based on
+            locales: Faker locales mixed into realistic names and needs
+                (defaults to DATA_GENERATOR_LOCALES; empty keeps "John Doe")
+            name_pool_size: Number of names generated up front and sampled
+                from (defaults to DATA_GENERATOR_NAME_POOL or 1000)
+        """
+        self.seed = seed
+        self.rng = random.Random(seed)
+        if locales is None:
+            locales = os.getenv("DATA_GENERATOR_LOCALES", "").split(",")
+        self.locales = tuple(locale.strip() for locale in locales if locale.strip())
+        self.name_pool_size = name_pool_size or int(
+            os.getenv("DATA_GENERATOR_NAME_POOL", "1000")
+        )
+        # The pool is built lazily from its own seed, drawn here so the
+        # payload stream does not depend on when the pool is first needed
+        self._pool_seed = self.rng.getrandbits(64) if self.locales else None
+        self._name_pool = None
+        self._pool_lock = threading.Lock()
+        if clock is None:
+            clock = datetime.now
+        elif isinstance(clock, date):
+            base = clock
+            if not isinstance(base, datetime):
+                base = datetime.combine(base, datetime.min.time())
+
+            def clock():
+                return base
+
+        self.clock = clock
+
+    @classmethod
+    def default(cls):
+        """Shared instance used when methods are called on the class"""
+        instance = cls._defaults.get(cls)
+        if instance is None:
+            with cls._defaults_lock:
+                instance = cls._defaults.setdefault(cls, cls())
+        return instance
+
+    def _names(self):
+        """Pre-generated (firstname, lastname) pairs, or None without locales"""
+        if not self.locales:
+            return None
+        if self._name_pool is None:
+            with self._pool_lock:
+                if self._name_pool is None:
+                    self._name_pool = self._build_name_pool(self._pool_seed)
+        return self._name_pool
+
+    def _build_name_pool(self, pool_seed):
+        """Generate a name pool from pool_seed, reusing Faker instances"""
+        pool_rng = random.Random(pool_seed)
+        counts = Counter(pool_rng.choices(self.locales, k=self.name_pool_size))
+        names = []
+        with _faker_lock:
+            for locale in sorted(counts):
+                fake = _faker(locale)
+                fake.seed_instance(pool_rng.getrandbits(64))
+                names.extend(
+                    (fake.first_name(), fake.last_name()) for _ in range(counts[locale])
+                )
+        pool_rng.shuffle(names)
+        return names
 
-    def generate_valid_credentials():
+    @_default_bound
+    def generate_valid_credentials(self):
         """Returns a dictionary with valid credentials"""
         return {"username": "admin", "password": "password123"}
 
-    def generate_invalid_credentials():
+    @_default_bound
+    def generate_invalid_credentials(self):
         """Returns a dictionary with invalid credentials"""
         return {"username": "invalid", "password": "wrongpassword"}
 
-    def generate_valid_booking_data():
+    @_default_bound
+    def generate_valid_booking_data(self):
         """Returns a dictionary with valid booking data"""
-        checkin = datetime.now() + timedelta(days=7)
+        checkin = self.clock() + timedelta(days=7)
         checkout = checkin + timedelta(days=3)
+        names = self._names()
+        firstname, lastname = self.rng.choice(names) if names else DEFAULT_NAME
+        needs = self.rng.choice(ADDITIONAL_NEEDS) if names else DEFAULT_NEEDS
         return {
-            "firstname": "John",
-            "lastname": "Doe",
-            "totalprice": random.randint(100, 1000),
+            "firstname": firstname,
+            "lastname": lastname,
+            "totalprice": self.rng.randint(100, 1000),
             "depositpaid": True,
             "bookingdates": {
                 "checkin": checkin.strftime("%Y-%m-%d"),
                 "checkout": checkout.strftime("%Y-%m-%d"),
             },
-            "additionalneeds": "Breakfast",
+            "additionalneeds": needs,
         }
 
-    def generate_booking_with_missing_firstname():
+    @_default_bound
+    def generate_bookings(self, n, seed=None, batch_size=1024, encoded=False):
+        """
+        Lazily yields n valid booking payloads
+
+        Prices, check-in offsets and stay lengths are drawn a batch at a time
+        and dates are looked up in a table of pre-formatted strings, so no
+        per-record datetime arithmetic or strftime is needed. With locales
+        configured, names and needs are sampled from pre-generated pools.
+
+        Args:
+            n: Number of payloads to generate
+            seed: Seed for a fresh RNG and name pool instead of the generator's own
+            batch_size: Number of records whose fields are drawn together
+            encoded: Yield request bodies as JSON bytes (see encode_json),
+                ready for BookingAPIClient.create_booking
+
+        Raises:
+            ValueError: If batch_size is less than 1
+        """
+        # Checked here rather than in the generator so it fails on call
+        if batch_size < 1:
+            raise ValueError(f"batch_size must be at least 1, got {batch_size}")
+        return self._generate_bookings(n, seed, batch_size, encoded)
+
+    def _generate_bookings(self, n, seed, batch_size, encoded):
+        """Generator behind generate_bookings"""
+        if seed is None:
+            rng = self.rng
+            names = self._names()
+        else:
+            # Everything, including the name pool, derives from seed alone
+            rng = random.Random(seed)
+            names = self._build_name_pool(rng.getrandbits(64)) if self.locales else None
+        first_day, last_day = CHECKIN_DAYS_RANGE
+        today = self.clock().date()
+        dates = [
+            (today + timedelta(days=offset)).isoformat()
+            for offset in range(last_day + MAX_NIGHTS + 1)
+        ]
+        prices = range(PRICE_RANGE[0], PRICE_RANGE[1] + 1)
+        checkin_offsets = range(first_day, last_day + 1)
+        nights = range(1, MAX_NIGHTS + 1)
+
+        remaining = n
+        while remaining > 0:
+            size = min(batch_size, remaining)
+            remaining -= size
+            batch = zip(
+                rng.choices(prices, k=size),
+                rng.choices(checkin_offsets, k=size),
+                rng.choices(nights, k=size),
+                rng.choices(names, k=size) if names else repeat(DEFAULT_NAME),
+                (
+                    rng.choices(ADDITIONAL_NEEDS, k=size)
+                    if names
+                    else repeat(DEFAULT_NEEDS)
+                ),
+            )
+            for price, checkin, stay, (firstname, lastname), needs in batch:
+                booking = {
+                    "firstname": firstname,
+                    "lastname": lastname,
+                    "totalprice": price,
+                    "depositpaid": True,
+                    "bookingdates": {
+                        "checkin": dates[checkin],
+                        "checkout": dates[checkin + stay],
+                    },
+                    "additionalneeds": needs,
+                }
+                yield encode_json(booking) if encoded else booking
+
+    @_default_bound
+    def export_bookings(self, path, n, batch_size=1024):
+        """
+        Generate n bookings straight into a JSONL dataset
+
+        Args:
+            path: Destination file; a .gz suffix enables gzip compression
+            n: Number of bookings to generate
+            batch_size: Passed on to generate_bookings
+
+        Returns:
+            Number of bookings written
+        """
+        return write_jsonl(path, self.generate_bookings(n, batch_size=batch_size))
+
+    @staticmethod
+    def load_bookings(path, encoded=False):
+        """Lazily yield the booking payloads stored by export_bookings
+
+        With encoded=True each payload is the stored JSON line as bytes, which
+        create_booking sends without re-serialising it.
+        """
+        return read_jsonl(path, encoded)
+
+    @_default_bound
+    def generate_booking_with_missing_firstname(self):
         """Returns a dictionary with missing firstname"""
-        data = DataGenerator.generate_valid_booking_data()
+        data = self.generate_valid_booking_data()
         del data["firstname"]
         return data
 
-    def generate_booking_with_missing_lastname():
+    @_default_bound
+    def generate_booking_with_missing_lastname(self):
         """Returns a dictionary with missing lastname"""
-        data = DataGenerator.generate_valid_booking_data()
+        data = self.generate_valid_booking_data()
         del data["lastname"]
         return data
 
-    def generate_booking_with_invalid_dates():
+    @_default_bound
+    def generate_booking_with_invalid_dates(self):
         """Returns a dictionary with invalid dates"""
-        data = DataGenerator.generate_valid_booking_data()
+        data = self.generate_valid_booking_data()
         data["bookingdates"]["checkin"] = "invalid-date"
         data["bookingdates"]["checkout"] = "invalid-date"
         return data
 
-    def generate_booking_with_missing_dates():
+    @_default_bound
+    def generate_booking_with_missing_dates(self):
         """Returns a dictionary with missing dates"""
-        data = DataGenerator.generate_valid_booking_data()
+        data = self.generate_valid_booking_data()
         del data["bookingdates"]
         return data
 
-    def generate_empty_booking_data():
+    @_default_bound
+    def generate_empty_booking_data(self):
         """Returns an empty dictionary"""
         return {}
 
-    def generate_booking_with_long_names():
+    @_default_bound
+    def generate_booking_with_long_names(self):
         """Returns a dictionary with long names"""
-        data = DataGenerator.generate_valid_booking_data()
+        data = self.generate_valid_booking_data()
         data["firstname"] = "A" * 255
         data["lastname"] = "B" * 255
         return data
 
-    def generate_booking_with_max_price():
+    @_default_bound
+    def generate_booking_with_max_price(self):
         """Returns a dictionary with max price"""
-        data = DataGenerator.generate_valid_booking_data()
+        data = self.generate_valid_booking_data()
         data["totalprice"] = int(2**31 - 1)  # Max 32-bit signed integer
         return data
 
-    def generate_booking_with_min_price():
+    @_default_bound
+    def generate_booking_with_min_price(self):
         """Returns a dictionary with min price"""
-        data = DataGenerator.generate_valid_booking_data()
+        data = self.generate_valid_booking_data()
         data["totalprice"] = 0
         return data
 
-    def generate_booking_with_special_chars():
+    @_default_bound
+    def generate_booking_with_special_chars(self):
         """Returns a dictionary with special characters"""
-        data = DataGenerator.generate_valid_booking_data()
+        data = self.generate_valid_booking_data()
         data["firstname"] = "!$@n"
         data["lastname"] = "$@rm@"
         return data
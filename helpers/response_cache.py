@@ -0,0 +1,91 @@
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Optional
+
+import requests
+
+
+class CacheEntry:
+    """Cached response together with its HTTP validators"""
+
+    __slots__ = ("response", "etag", "last_modified", "stored_at")
+
+    def __init__(self, response: requests.Response):
+        self.response = response
+        self.etag = response.headers.get("ETag")
+        self.last_modified = response.headers.get("Last-Modified")
+        self.stored_at = time.monotonic()
+
+    def conditional_headers(self) -> Dict[str, str]:
+        """Headers that turn a refetch into a conditional request"""
+        headers = {}
+        if self.etag:
+            headers["If-None-Match"] = self.etag
+        if self.last_modified:
+            headers["If-Modified-Since"] = self.last_modified
+        return headers
+
+
+class ResponseCache:
+    """Thread-safe LRU cache of GET responses with TTL expiry"""
+
+    def __init__(self, ttl: float, maxsize: int = 1024):
+        """
+        Initialize the cache
+
+        Args:
+            ttl: Seconds a response is served without revalidation
+            maxsize: Maximum number of cached responses
+        """
+        self.ttl = ttl
+        self.maxsize = maxsize
+        self._entries: "OrderedDict[str, CacheEntry]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[CacheEntry]:
+        """Return the entry for key, fresh or stale, marking it recently used"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+            return entry
+
+    def is_fresh(self, entry: CacheEntry) -> bool:
+        """Check whether an entry is still within its TTL"""
+        return time.monotonic() - entry.stored_at < self.ttl
+
+    def put(self, key: str, response: requests.Response) -> None:
+        """Cache a response, evicting the least recently used entry if full"""
+        with self._lock:
+            self._entries[key] = CacheEntry(response)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def touch(self, key: str) -> None:
+        """Restart the TTL of an entry the server confirmed unchanged"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                entry.stored_at = time.monotonic()
+
+    def invalidate(self, *keys: str) -> None:
+        """Drop the given keys from the cache"""
+        with self._lock:
+            for key in keys:
+                self._entries.pop(key, None)
+
+    def invalidate_prefix(self, prefix: str) -> None:
+        """Drop every key starting with prefix"""
+        with self._lock:
+            for key in [key for key in self._entries if key.startswith(prefix)]:
+                del self._entries[key]
+
+    def clear(self) -> None:
+        """Drop every cached response"""
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
@@ -1,75 +1,243 @@
-import json
+import glob
+import logging
 import os
-from datetime import datetime
+import re
+import threading
+from datetime import datetime, timedelta
+
+from helpers.storage import BACKENDS, WriteBackBackend, install_sigterm_handler
+from helpers.storage.base import current_run_id, current_worker_id
+
+logger = logging.getLogger(__name__)
 
 
 class SelfHealing:
     """Class implementing self-healing mechanisms for tests"""
 
-    DATA_FILE = "test_data.json"
+    # Store location; point SELF_HEALING_DIR at a tmpfs such as /dev/shm to
+    # keep bookkeeping off disk
+    DATA_FILE = os.getenv("SELF_HEALING_PATH") or os.path.join(
+        os.getenv("SELF_HEALING_DIR", ""), "test_data.json"
+    )
+    # Storage backend name, see helpers.storage.BACKENDS
+    BACKEND = os.getenv("SELF_HEALING_BACKEND", "json")
+    # Buffer mutations in memory and flush them in batches
+    WRITE_BACK = os.getenv("SELF_HEALING_WRITE_BACK", "").lower() in ("1", "true")
+    FLUSH_SIZE = int(os.getenv("SELF_HEALING_FLUSH_SIZE", "500"))
+    FLUSH_INTERVAL = float(os.getenv("SELF_HEALING_FLUSH_INTERVAL", "5"))
+    # Give each pytest-xdist worker its own store, merged by the controller
+    SHARD_BY_WORKER = os.getenv("SELF_HEALING_SHARD_WORKERS", "").lower() in (
+        "1",
+        "true",
+    )
+
+    # Set by configure(); otherwise backends are built from the attributes
+    # above and cached by their settings
+    _backend = None
+    _backends = {}
+    _lock = threading.RLock()
+
+    @classmethod
+    def configure(cls, backend):
+        """Use an explicit StorageBackend instance instead of BACKEND/DATA_FILE"""
+        with cls._lock:
+            for cached in cls._backends.values():
+                cached.close()
+            cls._backends.clear()
+            if cls._backend is not None:
+                cls._backend.close()
+            cls._backend = backend
 
     @classmethod
-    def store_token(cls, token):
-        """Store authentication token for recovery"""
-        data = cls._load_data()
-        data["token"] = token
-        data["token_timestamp"] = str(datetime.now())
-        cls._save_data(data)
+    def store_token(cls, token, expiry=None):
+        """Store authentication token and the datetime it expires for recovery"""
+        cls._get_backend(shared=True).store_token(token, expiry)
 
     @classmethod
     def get_token(cls):
         """Retrieve stored token"""
-        data = cls._load_data()
-        return data.get("token")
+        return cls._get_backend(shared=True).get_token()
+
+    @classmethod
+    def get_token_expiry(cls):
+        """Retrieve the stored token's expiry, or None if it was not recorded"""
+        expiry = cls._get_backend(shared=True).get_token_info().get("token_expiry")
+        return datetime.fromisoformat(expiry) if expiry else None
 
     @classmethod
     def store_booking_id(cls, booking_id):
         """Store booking ID for recovery purposes"""
-        data = cls._load_data()
-        if "booking_ids" not in data:
-            data["booking_ids"] = []
-        if booking_id not in data["booking_ids"]:
-            data["booking_ids"].append(booking_id)
-        data["last_updated"] = str(datetime.now())
-        cls._save_data(data)
+        cls._get_backend().store_booking_id(booking_id)
+
+    @classmethod
+    def store_booking_ids(cls, booking_ids):
+        """Store several booking IDs in a single write"""
+        cls._get_backend().store_booking_ids(booking_ids)
 
     @classmethod
     def get_booking_ids(cls):
         """Retrieve all stored booking IDs"""
-        data = cls._load_data()
-        return data.get("booking_ids", [])
+        return cls._get_backend().get_booking_ids()
+
+    @classmethod
+    def iter_booking_ids(cls):
+        """Iterate over stored booking IDs without building a list if possible"""
+        return cls._get_backend().iter_booking_ids()
+
+    @classmethod
+    def get_records(cls):
+        """Retrieve stored booking IDs with their run, worker and creation time"""
+        return cls._get_backend().get_records()
+
+    @classmethod
+    def get_stale_booking_ids(cls, older_than):
+        """IDs left behind by earlier runs that are older than older_than
+
+        Args:
+            older_than: Minimum age as a timedelta or a number of seconds
+        """
+        if isinstance(older_than, timedelta):
+            older_than = older_than.total_seconds()
+        return cls._get_backend().get_stale_booking_ids(older_than, current_run_id())
+
+    @classmethod
+    def contains(cls, booking_id):
+        """Check whether a booking ID is stored
+
+        Only the sqlite and mmap backends answer this, and count(), without
+        loading every stored ID.
+        """
+        return cls._get_backend().contains(booking_id)
+
+    @classmethod
+    def count(cls):
+        """Number of stored booking IDs"""
+        return cls._get_backend().count()
 
     @classmethod
     def remove_booking_id(cls, booking_id):
         """Remove a booking ID from storage"""
-        data = cls._load_data()
-        if "booking_ids" in data and booking_id in data["booking_ids"]:
-            data["booking_ids"].remove(booking_id)
-            cls._save_data(data)
+        cls._get_backend().remove_booking_id(booking_id)
+
+    @classmethod
+    def remove_booking_ids(cls, booking_ids):
+        """Remove several booking IDs from storage in a single write"""
+        cls._get_backend().remove_booking_ids(booking_ids)
 
     @classmethod
     def cleanup_test_data(cls):
         """Clean up any test data that might have been created"""
-        data = cls._load_data()
-        if "booking_ids" in data:
-            # Implement cleanup logic if needed
-            pass
-        cls._save_data({})  # Clear all data
+        cls._get_backend().clear()
+
+    @classmethod
+    def flush(cls):
+        """Persist changes buffered in write-back mode"""
+        for backend in [cls._backend, *cls._backends.values()]:
+            if backend is not None:
+                backend.flush()
 
     @classmethod
-    def _load_data(cls):
-        """Load stored test data"""
-        if not os.path.exists(cls.DATA_FILE):
-            return {}
+    def merge_worker_shards(cls):
+        """Fold per-worker stores into the shared store and delete them
 
-        with open(cls.DATA_FILE, "r") as f:
+        Run by the pytest-xdist controller once its workers have finished, so
+        IDs that workers failed to clean up stay visible to later runs. Tokens
+        always live in the shared store, so there is nothing to merge for them.
+
+        Returns:
+            Number of booking records merged
+        """
+        backend_class = BACKENDS[cls.BACKEND]
+        root = os.path.splitext(cls._data_path(None))[0]
+        # Some backends keep only sidecar files (e.g. a journal) until their
+        # first compaction, so discover shards by any file they left behind
+        worker_ids = {
+            match.group(1)
+            for path in glob.glob(f"{glob.escape(root)}.gw*")
+            if (match := re.match(r"\.(gw\d+)\.", path[len(root) :]))
+        }
+        target = cls._get_backend(shared=True)
+        merged = 0
+        for worker_id in sorted(worker_ids):
+            shard_path = cls._data_path(worker_id)
+            shard = backend_class(shard_path)
             try:
-                return json.load(f)
-            except json.JSONDecodeError:
-                return {}
+                records = shard.get_records()
+            finally:
+                shard.close()
+
+            if records:
+                target.store_records(records)
+                merged += len(records)
+
+            for leftover in glob.glob(f"{glob.escape(shard_path)}*"):
+                os.remove(leftover)
+
+        if merged:
+            logger.info(f"Merged {merged} booking IDs from worker stores")
+        return merged
 
     @classmethod
-    def _save_data(cls, data):
-        """Save test data to file"""
-        with open(cls.DATA_FILE, "w") as f:
-            json.dump(data, f)
+    def _get_backend(cls, shared=False):
+        """Return the active backend, creating it from BACKEND and DATA_FILE
+
+        With SHARD_BY_WORKER set, booking IDs go to the worker's own store;
+        shared=True selects the store common to all workers instead, which
+        holds the token so every worker can reuse it.
+        """
+        if cls._backend is not None:
+            return cls._backend
+        key = cls._config_key(shared)
+        backend = cls._backends.get(key)
+        if backend is not None:
+            return backend
+
+        with cls._lock:
+            # Close backends left behind by changed settings
+            current = {cls._config_key(False), cls._config_key(True)}
+            for stale in [stale for stale in cls._backends if stale not in current]:
+                cls._backends.pop(stale).close()
+            if key not in cls._backends:
+                cls._backends[key] = cls._create_backend(*key)
+            return cls._backends[key]
+
+    @classmethod
+    def _create_backend(cls, name, path, write_back):
+        """Instantiate the named backend on path, wrapped for write-back"""
+        if name not in BACKENDS:
+            raise ValueError(f"Unknown self-healing backend: {name}")
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        backend = BACKENDS[name](path)
+        if write_back:
+            backend = WriteBackBackend(
+                backend,
+                max_pending=cls.FLUSH_SIZE,
+                flush_interval=cls.FLUSH_INTERVAL,
+            )
+        return backend
+
+    @classmethod
+    def _config_key(cls, shared=False):
+        """Backend settings derived from the class attributes"""
+        sharded = cls.SHARD_BY_WORKER and not shared
+        worker_id = current_worker_id() if sharded else None
+        return cls.BACKEND, cls._data_path(worker_id), cls.WRITE_BACK
+
+    @classmethod
+    def _data_path(cls, worker_id):
+        """Store path for the active backend, optionally sharded by worker"""
+        root, ext = os.path.splitext(cls.DATA_FILE)
+        suffix = getattr(BACKENDS.get(cls.BACKEND), "FILE_SUFFIX", None)
+        if suffix:
+            ext = suffix
+        if worker_id and worker_id != "master":
+            root = f"{root}.{worker_id}"
+        return root + ext
+
+
+# The backend is created lazily, often on a bulk-request pool thread where
+# signal handlers cannot be installed, so hook SIGTERM at import instead
+if SelfHealing.WRITE_BACK:
+    install_sigterm_handler()
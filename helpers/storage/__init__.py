@@ -0,0 +1,24 @@
+from helpers.storage.base import StorageBackend
+from helpers.storage.journal_backend import JournalBackend
+from helpers.storage.json_backend import JsonFileBackend
+from helpers.storage.mmap_backend import MmapBackend
+from helpers.storage.sqlite_backend import SQLiteBackend
+from helpers.storage.write_back import WriteBackBackend, install_sigterm_handler
+
+BACKENDS = {
+    "json": JsonFileBackend,
+    "journal": JournalBackend,
+    "mmap": MmapBackend,
+    "sqlite": SQLiteBackend,
+}
+
+__all__ = [
+    "BACKENDS",
+    "JournalBackend",
+    "JsonFileBackend",
+    "MmapBackend",
+    "SQLiteBackend",
+    "StorageBackend",
+    "WriteBackBackend",
+    "install_sigterm_handler",
+]
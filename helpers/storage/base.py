@@ -0,0 +1,129 @@
+import os
+import time
+import uuid
+from typing import Any, NamedTuple, Optional
+
+_run_id = None
+
+
+def current_run_id():
+    """ID shared by every process taking part in the current test run"""
+    global _run_id
+    if _run_id is None:
+        run_id = os.environ.get("SELF_HEALING_RUN_ID") or os.environ.get(
+            "PYTEST_XDIST_TESTRUNUID"
+        )
+        if not run_id:
+            run_id = uuid.uuid4().hex
+        # Exported so worker processes spawned later inherit the same run ID
+        os.environ["SELF_HEALING_RUN_ID"] = run_id
+        _run_id = run_id
+    return _run_id
+
+
+def current_worker_id():
+    """pytest-xdist worker name, or "master" outside of a worker process"""
+    return os.environ.get("PYTEST_XDIST_WORKER", "master")
+
+
+class BookingRecord(NamedTuple):
+    """A stored booking ID tagged with the run and worker that created it"""
+
+    booking_id: Any
+    run_id: Optional[str] = None
+    worker_id: Optional[str] = None
+    created_at: float = 0.0
+
+    @classmethod
+    def new(cls, booking_id):
+        """Tag a booking ID with the current run, worker and time"""
+        return cls(booking_id, current_run_id(), current_worker_id(), time.time())
+
+
+class StorageBackend:
+    """Interface for the persistent store behind SelfHealing"""
+
+    # Replaces the extension of SelfHealing.DATA_FILE when set
+    FILE_SUFFIX = None
+
+    def store_token(self, token, expiry=None):
+        """Store authentication token and its expiry datetime for recovery"""
+        raise NotImplementedError
+
+    def get_token(self):
+        """Retrieve stored token"""
+        return self.get_token_info().get("token")
+
+    def get_token_info(self):
+        """Retrieve the stored token fields
+
+        Returns:
+            Dict with any of "token", "token_timestamp" and "token_expiry"
+            (ISO 8601 string)
+        """
+        raise NotImplementedError
+
+    def store_booking_id(self, booking_id):
+        """Store booking ID for recovery purposes"""
+        self.store_records([BookingRecord.new(booking_id)])
+
+    def store_booking_ids(self, booking_ids):
+        """Store several booking IDs in a single write"""
+        self.store_records(
+            [BookingRecord.new(booking_id) for booking_id in booking_ids]
+        )
+
+    def store_records(self, records):
+        """Store tagged booking records, keeping the first record for each ID"""
+        raise NotImplementedError
+
+    def get_records(self):
+        """Retrieve all stored booking records in insertion order"""
+        raise NotImplementedError
+
+    def get_booking_ids(self):
+        """Retrieve all stored booking IDs in insertion order"""
+        return [record.booking_id for record in self.get_records()]
+
+    def iter_booking_ids(self):
+        """Iterate over stored booking IDs"""
+        return iter(self.get_booking_ids())
+
+    def get_stale_booking_ids(self, older_than, run_id):
+        """IDs created more than older_than seconds ago by runs other than run_id"""
+        cutoff = time.time() - older_than
+        return [
+            record.booking_id
+            for record in self.get_records()
+            if record.run_id != run_id and record.created_at < cutoff
+        ]
+
+    def contains(self, booking_id):
+        """Check whether a booking ID is stored
+
+        Backends that cannot index the store (json, journal) load every ID
+        to answer this and count(); sqlite and mmap do not.
+        """
+        return booking_id in set(self.get_booking_ids())
+
+    def count(self):
+        """Number of stored booking IDs"""
+        return len(self.get_booking_ids())
+
+    def remove_booking_id(self, booking_id):
+        """Remove a booking ID from storage"""
+        self.remove_booking_ids([booking_id])
+
+    def remove_booking_ids(self, booking_ids):
+        """Remove several booking IDs from storage in a single write"""
+        raise NotImplementedError
+
+    def clear(self):
+        """Drop everything held in the store"""
+        raise NotImplementedError
+
+    def flush(self):
+        """Persist any buffered changes"""
+
+    def close(self):
+        """Release any resources held by the backend"""
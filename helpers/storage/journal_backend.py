@@ -0,0 +1,132 @@
+import json
+import os
+import threading
+
+from helpers.storage.base import BookingRecord, StorageBackend
+from helpers.storage.file_lock import FileLock, atomic_write
+from helpers.storage.json_backend import (
+    TOKEN_KEYS,
+    dump_records,
+    load_records,
+    token_fields,
+)
+
+
+class JournalBackend(StorageBackend):
+    """Append each mutation to a journal, compacting it into a snapshot
+
+    The snapshot uses the same document layout as JsonFileBackend. Every
+    mutation appends one JSON line to ``<path>.journal`` so writes cost O(1)
+    bytes; reads replay the journal over the snapshot. A torn final record
+    left by a crash is skipped on replay. Once the journal grows past
+    ``compact_bytes`` it is folded into the snapshot and truncated.
+    """
+
+    def __init__(self, path, compact_bytes=1 << 20):
+        self.path = path
+        self.journal_path = f"{path}.journal"
+        self.compact_bytes = compact_bytes
+        self._lock = threading.Lock()
+        self._file_lock = FileLock(f"{path}.lock")
+
+    def store_token(self, token, expiry=None):
+        self._append([{"op": "token", **token_fields(token, expiry)}])
+
+    def get_token_info(self):
+        data = self._read()[0]
+        return {key: data[key] for key in TOKEN_KEYS if key in data}
+
+    def store_records(self, records):
+        self._append([{"op": "add", "record": list(record)} for record in records])
+
+    def get_records(self):
+        return list(self._read()[1].values())
+
+    def get_booking_ids(self):
+        return list(self._read()[1])
+
+    def contains(self, booking_id):
+        return booking_id in self._read()[1]
+
+    def count(self):
+        return len(self._read()[1])
+
+    def remove_booking_ids(self, booking_ids):
+        self._append([{"op": "remove", "id": booking_id} for booking_id in booking_ids])
+
+    def clear(self):
+        self._append([{"op": "clear"}])
+
+    def compact(self):
+        """Fold the journal into the snapshot and truncate it"""
+        with self._lock, self._file_lock:
+            self._compact()
+
+    def _read(self):
+        """Replay under the lock so a concurrent compaction can't be observed"""
+        with self._lock, self._file_lock:
+            return self._replay()
+
+    def _append(self, records):
+        """Append records to the journal as newline-terminated JSON"""
+        if not records:
+            return
+        payload = "".join(json.dumps(record) + "\n" for record in records)
+        with self._lock, self._file_lock:
+            with open(self.journal_path, "a+b") as f:
+                # Terminate a torn record from a crashed writer so it can't
+                # swallow the record appended after it
+                if f.seek(0, os.SEEK_END) > 0:
+                    f.seek(-1, os.SEEK_END)
+                    if f.read(1) != b"\n":
+                        payload = "\n" + payload
+                f.write(payload.encode())
+                size = f.tell()
+            if size >= self.compact_bytes:
+                self._compact()
+
+    def _compact(self):
+        """Rewrite the snapshot from a replay; caller must hold both locks"""
+        data, index = self._replay()
+        atomic_write(self.path, json.dumps(dump_records(data, index)))
+        with open(self.journal_path, "w"):
+            pass
+
+    def _replay(self):
+        """Apply the journal on top of the snapshot
+
+        Returns:
+            The document without booking records, and the records as an
+            insertion-ordered dict keyed by booking ID
+        """
+        data = self._load_snapshot()
+        index = load_records(data)
+        try:
+            with open(self.journal_path, "rb") as f:
+                for line in f:
+                    try:
+                        record = json.loads(line)
+                    except ValueError:
+                        continue
+                    op = record.get("op")
+                    if op == "add":
+                        booking = BookingRecord(*record["record"])
+                        index.setdefault(booking.booking_id, booking)
+                    elif op == "remove":
+                        index.pop(record["id"], None)
+                    elif op == "token":
+                        data.update((key, record.get(key)) for key in TOKEN_KEYS)
+                    elif op == "clear":
+                        data = {}
+                        index.clear()
+        except FileNotFoundError:
+            pass
+        return data, index
+
+    def _load_snapshot(self):
+        """Load the compacted snapshot"""
+        try:
+            with open(self.path, "r") as f:
+                return json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return {}
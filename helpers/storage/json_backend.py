@@ -0,0 +1,279 @@
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime
+from itertools import chain, repeat
+
+from helpers.storage.base import BookingRecord, StorageBackend
+from helpers.storage.file_lock import FileLock, atomic_write
+
+TOKEN_KEYS = ("token", "token_timestamp", "token_expiry")
+
+
+def token_fields(token, expiry):
+    """Document fields recording a token and when it expires"""
+    return {
+        "token": token,
+        "token_timestamp": str(datetime.now()),
+        "token_expiry": expiry.isoformat() if expiry else None,
+    }
+
+
+class BookingTable:
+    """The booking records of a store document, held as parallel columns
+
+    The ``id`` column lists every booking ID. The run, worker and creation
+    time columns are run-length encoded as ``[value, count]`` pairs, since
+    IDs are appended in bursts from one run and worker, and run and worker
+    IDs are interned in the document's ``tags`` list and referenced by
+    position (-1 for none). The document therefore costs little more to
+    parse than a bare ID list, and ID-only queries never build
+    BookingRecord objects. Documents written by earlier versions, with a
+    ``bookings`` list of rows or an untagged ``booking_ids`` list, are
+    converted on load.
+    """
+
+    def __init__(self, data):
+        """Pop the booking table out of a store document"""
+        self.tags = data.pop("tags", [])
+        self._tag_index = None
+        table = data.pop("bookings", None)
+        if isinstance(table, dict):
+            self.ids = table["id"]
+            self.runs = table["run"]
+            self.workers = table["worker"]
+            self.created = table["created"]
+        else:
+            self.ids, self.runs, self.workers, self.created = [], [], [], []
+            legacy = [BookingRecord(*row) for row in table or []]
+            legacy += map(BookingRecord, data.pop("booking_ids", []))
+            self.add(legacy)
+
+    def add(self, records):
+        """Append records for IDs not yet present; True if any were added"""
+        known = set(self.ids)
+        size = len(known)
+        for record in records:
+            if record.booking_id in known:
+                continue
+            known.add(record.booking_id)
+            self.ids.append(record.booking_id)
+            _rle_append(self.runs, self._intern(record.run_id))
+            _rle_append(self.workers, self._intern(record.worker_id))
+            _rle_append(self.created, int(record.created_at))
+        return len(known) > size
+
+    def remove(self, booking_ids):
+        """Drop the given IDs; True if any were present"""
+        drop = set(booking_ids).intersection(self.ids)
+        if not drop:
+            return False
+        positions = [i for i, booking_id in enumerate(self.ids) if booking_id in drop]
+        self.ids[:] = [booking_id for booking_id in self.ids if booking_id not in drop]
+        for column in (self.runs, self.workers, self.created):
+            column[:] = _rle_delete(column, positions)
+        self._prune_tags()
+        return True
+
+    def records(self):
+        """Iterate over the stored BookingRecords in insertion order"""
+        tags = self.tags
+        for booking_id, run, worker, created in zip(
+            self.ids,
+            _rle_values(self.runs),
+            _rle_values(self.workers),
+            _rle_values(self.created),
+        ):
+            yield BookingRecord(
+                booking_id,
+                tags[run] if run >= 0 else None,
+                tags[worker] if worker >= 0 else None,
+                created,
+            )
+
+    def stale_ids(self, older_than, run_id):
+        """IDs created more than older_than seconds ago by other runs"""
+        cutoff = time.time() - older_than
+        run = self._indexes().get(run_id, -1) if run_id is not None else -1
+        return [
+            booking_id
+            for booking_id, booking_run, created in zip(
+                self.ids, _rle_values(self.runs), _rle_values(self.created)
+            )
+            if booking_run != run and created < cutoff
+        ]
+
+    def dump(self, data):
+        """Store the table back into a store document"""
+        data["tags"] = self.tags
+        data["bookings"] = {
+            "id": self.ids,
+            "run": self.runs,
+            "worker": self.workers,
+            "created": self.created,
+        }
+        return data
+
+    def _indexes(self):
+        if self._tag_index is None:
+            self._tag_index = {tag: i for i, tag in enumerate(self.tags)}
+        return self._tag_index
+
+    def _intern(self, tag):
+        """Position of tag in the tag list, adding it if needed; -1 for None"""
+        if tag is None:
+            return -1
+        indexes = self._indexes()
+        index = indexes.get(tag)
+        if index is None:
+            index = indexes[tag] = len(self.tags)
+            self.tags.append(tag)
+        return index
+
+    def _prune_tags(self):
+        """Forget tags no longer referenced, e.g. of runs fully cleaned up"""
+        used = sorted(
+            {value for value, _ in self.runs} | {value for value, _ in self.workers}
+        )
+        used = [i for i in used if i >= 0]
+        if len(used) == len(self.tags):
+            return
+        remap = {old: new for new, old in enumerate(used)}
+        remap[-1] = -1
+        self.tags = [self.tags[i] for i in used]
+        for column in (self.runs, self.workers):
+            for pair in column:
+                pair[0] = remap[pair[0]]
+        self._tag_index = None
+
+
+def _rle_append(column, value):
+    """Append value to a run-length encoded column"""
+    if column and column[-1][0] == value:
+        column[-1][1] += 1
+    else:
+        column.append([value, 1])
+
+
+def _rle_values(column):
+    """Iterate over the values of a run-length encoded column"""
+    return chain.from_iterable(repeat(value, count) for value, count in column)
+
+
+def _rle_delete(column, positions):
+    """Run-length encoded column without the values at sorted positions"""
+    result = []
+    positions = iter(positions)
+    position = next(positions, None)
+    start = 0
+    for value, count in column:
+        end = start + count
+        while position is not None and position < end:
+            count -= 1
+            position = next(positions, None)
+        start = end
+        if count:
+            if result and result[-1][0] == value:
+                result[-1][1] += count
+            else:
+                result.append([value, count])
+    return result
+
+
+def load_records(data):
+    """Pop booking records out of a store document as an ordered ID index"""
+    return {record.booking_id: record for record in BookingTable(data).records()}
+
+
+def dump_records(data, index):
+    """Store an ordered ID index back into a store document"""
+    table = BookingTable({})
+    table.add(index.values())
+    return table.dump(data)
+
+
+class JsonFileBackend(StorageBackend):
+    """Store everything in a single JSON document, rewritten on each change
+
+    Mutations hold an exclusive lock on a sidecar ``.lock`` file for the whole
+    read-modify-write cycle and replace the document atomically, so several
+    processes (e.g. pytest-xdist workers) can share one file without losing
+    updates, and readers never observe a partially written document.
+
+    Every query parses the document. contains() and count() read only its
+    ID column and build no records, but their cost still grows with the
+    store; the sqlite and mmap backends answer them without a full load.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._lock = threading.Lock()
+        self._file_lock = FileLock(f"{path}.lock")
+
+    def store_token(self, token, expiry=None):
+        with self._locked():
+            data = self._load_data()
+            data.update(token_fields(token, expiry))
+            self._save_data(data)
+
+    def get_token_info(self):
+        data = self._load_data()
+        return {key: data[key] for key in TOKEN_KEYS if key in data}
+
+    def store_records(self, records):
+        with self._locked():
+            data = self._load_data()
+            table = BookingTable(data)
+            if table.add(records):
+                table.dump(data)
+                data["last_updated"] = str(datetime.now())
+                self._save_data(data)
+
+    def get_records(self):
+        return list(BookingTable(self._load_data()).records())
+
+    def get_booking_ids(self):
+        return BookingTable(self._load_data()).ids
+
+    def get_stale_booking_ids(self, older_than, run_id):
+        return BookingTable(self._load_data()).stale_ids(older_than, run_id)
+
+    def contains(self, booking_id):
+        return booking_id in BookingTable(self._load_data()).ids
+
+    def count(self):
+        return len(BookingTable(self._load_data()).ids)
+
+    def remove_booking_ids(self, booking_ids):
+        with self._locked():
+            data = self._load_data()
+            table = BookingTable(data)
+            if table.remove(booking_ids):
+                self._save_data(table.dump(data))
+
+    def clear(self):
+        with self._locked():
+            self._save_data({})
+
+    @contextmanager
+    def _locked(self):
+        """Hold both the in-process and the cross-process lock"""
+        with self._lock, self._file_lock:
+            yield
+
+    def _load_data(self):
+        """Load stored test data"""
+        if not os.path.exists(self.path):
+            return {}
+
+        with open(self.path, "r") as f:
+            try:
+                return json.load(f)
+            except json.JSONDecodeError:
+                return {}
+
+    def _save_data(self, data):
+        """Save test data to file"""
+        atomic_write(self.path, json.dumps(data))
@@ -0,0 +1,229 @@
+import bisect
+import functools
+import hashlib
+import json
+import mmap
+import os
+import struct
+import threading
+import time
+from contextlib import contextmanager
+
+from helpers.storage.base import BookingRecord, StorageBackend
+from helpers.storage.file_lock import FileLock, atomic_write
+from helpers.storage.json_backend import TOKEN_KEYS, token_fields
+
+# booking_id, created_at (ms), run tag, worker tag as native int64 words
+RECORD = struct.Struct("=qqqq")
+WORDS = 4
+TAG_MASK = 2**64 - 1
+
+
+@functools.lru_cache(maxsize=64)
+def _tag(value):
+    """Fold a run or worker ID into a signed 64-bit tag
+
+    Values of the form "#<hex>", as reported by get_records(), are tags
+    already and are decoded rather than hashed again.
+    """
+    if value is None:
+        return 0
+    if value.startswith("#"):
+        return int.from_bytes(
+            int(value[1:], 16).to_bytes(8, "little"), "little", signed=True
+        )
+    digest = hashlib.blake2b(value.encode(), digest_size=8).digest()
+    return int.from_bytes(digest, "little", signed=True)
+
+
+def _contains(ids, booking_id):
+    """Bisect a sorted ID column for booking_id"""
+    position = bisect.bisect_left(ids, booking_id)
+    return position < len(ids) and ids[position] == booking_id
+
+
+class MmapBackend(StorageBackend):
+    """Store booking IDs as a sorted fixed-width int64 array in a mapped file
+
+    Each record is four int64 words (booking ID, creation time in ms, run
+    tag, worker tag) kept sorted by booking ID. Reads map the file instead of
+    parsing it and lookups bisect the mapped ID column, so no Python object
+    is held per stored ID; iter_booking_ids() walks a packed copy of the ID
+    column so the mapping is not held open while callers mutate the store.
+    IDs above every stored ID, the usual case since the API issues them in
+    increasing order, are appended in place; other changes rewrite the array
+    and swap it in atomically. Run and worker IDs are kept only as hashed
+    tags, which get_records() reports as "#<hex>" strings. The token lives in a
+    small JSON sidecar.
+
+    POSIX only: readers map the file without taking the lock, and Windows
+    refuses to replace a file that another reader still has mapped.
+    """
+
+    FILE_SUFFIX = ".ids"
+
+    def __init__(self, path):
+        self.path = path
+        self.meta_path = f"{path}.meta"
+        self._lock = threading.Lock()
+        self._file_lock = FileLock(f"{path}.lock")
+
+    def store_token(self, token, expiry=None):
+        with self._locked():
+            atomic_write(self.meta_path, json.dumps(token_fields(token, expiry)))
+
+    def get_token_info(self):
+        try:
+            with open(self.meta_path, "r") as f:
+                data = json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return {}
+        return {key: data[key] for key in TOKEN_KEYS if key in data}
+
+    def store_records(self, records):
+        rows = {}
+        for record in records:
+            rows.setdefault(
+                record.booking_id,
+                (
+                    record.booking_id,
+                    int(record.created_at * 1000),
+                    _tag(record.run_id),
+                    _tag(record.worker_id),
+                ),
+            )
+
+        with self._locked():
+            with self._view() as words, self._ids(words) as ids:
+                new = [
+                    rows[booking_id]
+                    for booking_id in sorted(rows)
+                    if not _contains(ids, booking_id)
+                ]
+                if not new:
+                    return
+                chunks = None
+                if len(ids) and new[0][0] < ids[-1]:
+                    # Splice the new records into the sorted array in one pass
+                    data = words.tobytes()
+                    chunks = []
+                    start = 0
+                    for row in new:
+                        position = bisect.bisect_left(ids, row[0]) * RECORD.size
+                        chunks.append(data[start:position])
+                        chunks.append(RECORD.pack(*row))
+                        start = position
+                    chunks.append(data[start:])
+            # Only write once the mapping is closed
+            if chunks is None:
+                self._append(new)
+            else:
+                atomic_write(self.path, b"".join(chunks), mode="wb")
+
+    def get_records(self):
+        with self._view() as words:
+            return [
+                BookingRecord(
+                    booking_id,
+                    f"#{run & TAG_MASK:016x}",
+                    f"#{worker & TAG_MASK:016x}",
+                    created / 1000,
+                )
+                for booking_id, created, run, worker in RECORD.iter_unpack(words)
+            ]
+
+    def iter_booking_ids(self):
+        with self._view() as words, self._ids(words) as ids:
+            snapshot = memoryview(ids.tobytes()).cast("q")
+        yield from snapshot
+
+    def get_booking_ids(self):
+        with self._view() as words, self._ids(words) as ids:
+            return ids.tolist()
+
+    def get_stale_booking_ids(self, older_than, run_id):
+        cutoff = (time.time() - older_than) * 1000
+        run_tag = _tag(run_id)
+        with self._view() as words:
+            return [
+                booking_id
+                for booking_id, created, run, _ in RECORD.iter_unpack(words)
+                if run != run_tag and created < cutoff
+            ]
+
+    def contains(self, booking_id):
+        with self._view() as words, self._ids(words) as ids:
+            return _contains(ids, booking_id)
+
+    def count(self):
+        try:
+            return os.path.getsize(self.path) // RECORD.size
+        except FileNotFoundError:
+            return 0
+
+    def remove_booking_ids(self, booking_ids):
+        with self._locked():
+            with self._view() as words, self._ids(words) as ids:
+                positions = sorted(
+                    bisect.bisect_left(ids, booking_id)
+                    for booking_id in set(booking_ids)
+                    if _contains(ids, booking_id)
+                )
+                if not positions:
+                    return
+                data = words.tobytes()
+
+            chunks = []
+            start = 0
+            for position in positions:
+                chunks.append(data[start : position * RECORD.size])
+                start = (position + 1) * RECORD.size
+            chunks.append(data[start:])
+            atomic_write(self.path, b"".join(chunks), mode="wb")
+
+    def clear(self):
+        with self._locked():
+            atomic_write(self.path, b"", mode="wb")
+            if os.path.exists(self.meta_path):
+                os.remove(self.meta_path)
+
+    def _append(self, rows):
+        """Append records past the current end; caller must hold the locks"""
+        with open(self.path, "ab") as f:
+            # Drop a torn record left by a crash during an earlier append
+            size = f.tell()
+            if size % RECORD.size:
+                f.truncate(size - size % RECORD.size)
+            f.write(b"".join(RECORD.pack(*row) for row in rows))
+
+    @contextmanager
+    def _locked(self):
+        """Hold both the in-process and the cross-process lock"""
+        with self._lock, self._file_lock:
+            yield
+
+    @contextmanager
+    def _view(self):
+        """Map the store read-only and yield it as a flat int64 memoryview"""
+        try:
+            f = open(self.path, "rb")
+        except FileNotFoundError:
+            yield memoryview(b"").cast("q")
+            return
+        with f:
+            size = os.fstat(f.fileno()).st_size
+            size -= size % RECORD.size
+            if not size:
+                yield memoryview(b"").cast("q")
+                return
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                with memoryview(mapped) as raw, raw[:size] as window:
+                    with window.cast("q") as words:
+                        yield words
+
+    @staticmethod
+    @contextmanager
+    def _ids(words):
+        """Strided zero-copy view of the booking ID column"""
+        with words[0::WORDS] as ids:
+            yield ids
@@ -0,0 +1,153 @@
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime
+
+from helpers.storage.base import BookingRecord, StorageBackend
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS booking_ids (
+    seq INTEGER PRIMARY KEY AUTOINCREMENT,
+    booking_id INTEGER NOT NULL UNIQUE
+);
+CREATE TABLE IF NOT EXISTS metadata (
+    key TEXT PRIMARY KEY,
+    value TEXT
+);
+"""
+
+# Columns added after the first release of the schema
+TAG_COLUMNS = {"run_id": "TEXT", "worker_id": "TEXT", "created_at": "REAL"}
+
+
+class SQLiteBackend(StorageBackend):
+    """Store booking IDs in an indexed SQLite table using WAL journaling"""
+
+    FILE_SUFFIX = ".db"
+
+    def __init__(self, path, timeout=30.0):
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(
+            path, timeout=timeout, isolation_level=None, check_same_thread=False
+        )
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(SCHEMA)
+        self._migrate()
+
+    def store_token(self, token, expiry=None):
+        with self._lock, self._transaction():
+            self._set_metadata("token", token)
+            self._set_metadata("token_timestamp", str(datetime.now()))
+            self._set_metadata("token_expiry", expiry.isoformat() if expiry else None)
+
+    def get_token_info(self):
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT key, value FROM metadata "
+                "WHERE key IN ('token', 'token_timestamp', 'token_expiry')"
+            ).fetchall()
+        return dict(rows)
+
+    def store_records(self, records):
+        with self._lock, self._transaction():
+            self._conn.executemany(
+                "INSERT OR IGNORE INTO booking_ids "
+                "(booking_id, run_id, worker_id, created_at) VALUES (?, ?, ?, ?)",
+                records,
+            )
+            self._set_metadata("last_updated", str(datetime.now()))
+
+    def get_records(self):
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT booking_id, run_id, worker_id, COALESCE(created_at, 0) "
+                "FROM booking_ids ORDER BY seq"
+            ).fetchall()
+        return [BookingRecord(*row) for row in rows]
+
+    def get_stale_booking_ids(self, older_than, run_id):
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT booking_id FROM booking_ids "
+                "WHERE COALESCE(created_at, 0) < ? AND run_id IS NOT ? ORDER BY seq",
+                (time.time() - older_than, run_id),
+            ).fetchall()
+        return [row[0] for row in rows]
+
+    def get_booking_ids(self):
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT booking_id FROM booking_ids ORDER BY seq"
+            ).fetchall()
+        return [row[0] for row in rows]
+
+    def contains(self, booking_id):
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT 1 FROM booking_ids WHERE booking_id = ?", (booking_id,)
+            ).fetchone()
+        return row is not None
+
+    def count(self):
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM booking_ids").fetchone()[0]
+
+    def remove_booking_id(self, booking_id):
+        with self._lock:
+            self._conn.execute(
+                "DELETE FROM booking_ids WHERE booking_id = ?", (booking_id,)
+            )
+
+    def remove_booking_ids(self, booking_ids):
+        with self._lock, self._transaction():
+            self._conn.executemany(
+                "DELETE FROM booking_ids WHERE booking_id = ?",
+                ((booking_id,) for booking_id in booking_ids),
+            )
+
+    def clear(self):
+        with self._lock, self._transaction():
+            self._conn.execute("DELETE FROM booking_ids")
+            self._conn.execute("DELETE FROM metadata")
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+    def _migrate(self):
+        """Add tag columns to databases created before they existed"""
+        existing = {
+            row[1] for row in self._conn.execute("PRAGMA table_info(booking_ids)")
+        }
+        for column, column_type in TAG_COLUMNS.items():
+            if column not in existing:
+                try:
+                    self._conn.execute(
+                        f"ALTER TABLE booking_ids ADD COLUMN {column} {column_type}"
+                    )
+                except sqlite3.OperationalError:
+                    # Another process migrated the table concurrently
+                    pass
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS booking_ids_created_at "
+            "ON booking_ids (created_at)"
+        )
+
+    def _set_metadata(self, key, value):
+        self._conn.execute(
+            "INSERT OR REPLACE INTO metadata (key, value) VALUES (?, ?)", (key, value)
+        )
+
+    @contextmanager
+    def _transaction(self):
+        """Group statements into one immediate-mode transaction"""
+        self._conn.execute("BEGIN IMMEDIATE")
+        try:
+            yield
+        except BaseException:
+            self._conn.execute("ROLLBACK")
+            raise
+        self._conn.execute("COMMIT")
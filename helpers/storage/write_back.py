@@ -0,0 +1,215 @@
+import atexit
+import logging
+import os
+import signal
+import threading
+import weakref
+from contextlib import contextmanager
+
+from helpers.storage.base import BookingRecord, StorageBackend
+
+logger = logging.getLogger(__name__)
+
+# Live write-back backends, flushed by the shared SIGTERM handler
+_instances = weakref.WeakSet()
+_handler_lock = threading.Lock()
+_previous_sigterm = None
+_sigterm_installed = False
+# Per-thread depth of calls into wrapped backends, which may hold their
+# non-reentrant locks, and a SIGTERM deferred until those calls return
+_local = threading.local()
+_deferred_signum = None
+
+
+def install_sigterm_handler():
+    """Flush every write-back backend on SIGTERM, then defer to the old handler
+
+    Python only lets the main thread install signal handlers, so this must
+    run there; backends are often created lazily on worker threads.
+
+    Returns:
+        True if the handler is installed
+    """
+    global _previous_sigterm, _sigterm_installed
+    with _handler_lock:
+        if _sigterm_installed:
+            return True
+        if threading.current_thread() is not threading.main_thread():
+            return False
+        _previous_sigterm = signal.signal(signal.SIGTERM, _on_sigterm)
+        _sigterm_installed = True
+        return True
+
+
+def _on_sigterm(signum, frame):
+    """Flush pending writes before handing SIGTERM on
+
+    A signal that lands while this thread is inside a wrapped backend is
+    deferred until that call returns, since flushing then would block on
+    locks the interrupted call already holds.
+    """
+    global _deferred_signum
+    if getattr(_local, "depth", 0):
+        _deferred_signum = signum
+        return
+    _deferred_signum = None
+    for backend in list(_instances):
+        backend.flush()
+    previous = _previous_sigterm
+    if callable(previous):
+        previous(signum, frame)
+    elif previous != signal.SIG_IGN:
+        signal.signal(signum, signal.SIG_DFL)
+        os.kill(os.getpid(), signum)
+
+
+@contextmanager
+def _inner_call():
+    """Mark this thread as inside a wrapped backend for the SIGTERM handler"""
+    _local.depth = getattr(_local, "depth", 0) + 1
+    try:
+        yield
+    finally:
+        _local.depth -= 1
+        if not _local.depth and _deferred_signum is not None:
+            _on_sigterm(_deferred_signum, None)
+
+
+class WriteBackBackend(StorageBackend):
+    """Buffer mutations in memory and flush them to another backend in batches
+
+    Adds and removes are coalesced and written with one batched call once
+    ``max_pending`` mutations accumulate or ``flush_interval`` seconds pass,
+    and again at interpreter exit or on SIGTERM. Reads flush first so they
+    always see this process's own changes.
+    """
+
+    def __init__(self, inner, max_pending=500, flush_interval=5.0):
+        self.inner = inner
+        self.max_pending = max_pending
+        self.flush_interval = flush_interval
+        self._lock = threading.RLock()
+        self._pending_adds = {}
+        self._pending_removes = set()
+        self._pending_clear = False
+        self._timer = None
+
+        atexit.register(self.flush)
+        _instances.add(self)
+        if not install_sigterm_handler():
+            logger.warning(
+                "Write-back storage created off the main thread without a "
+                "SIGTERM handler; buffered IDs are lost if the process is "
+                "terminated. Call install_sigterm_handler() from the main thread."
+            )
+
+    def store_token(self, token, expiry=None):
+        # Tokens change rarely and matter most after a restart, so write
+        # through (after any pending clear, which would otherwise erase it)
+        with self._lock:
+            self.flush()
+            with _inner_call():
+                self.inner.store_token(token, expiry)
+
+    def get_token_info(self):
+        with self._lock:
+            if self._pending_clear:
+                return {}
+        with _inner_call():
+            return self.inner.get_token_info()
+
+    def store_booking_id(self, booking_id):
+        self.store_records([BookingRecord.new(booking_id)])
+
+    def store_records(self, records):
+        with self._lock:
+            for record in records:
+                self._pending_removes.discard(record.booking_id)
+                self._pending_adds.setdefault(record.booking_id, record)
+            self._mutated()
+
+    def get_records(self):
+        self.flush()
+        with _inner_call():
+            return self.inner.get_records()
+
+    def get_booking_ids(self):
+        self.flush()
+        with _inner_call():
+            return self.inner.get_booking_ids()
+
+    def iter_booking_ids(self):
+        self.flush()
+        with _inner_call():
+            return self.inner.iter_booking_ids()
+
+    def get_stale_booking_ids(self, older_than, run_id):
+        self.flush()
+        with _inner_call():
+            return self.inner.get_stale_booking_ids(older_than, run_id)
+
+    def contains(self, booking_id):
+        with self._lock:
+            if booking_id in self._pending_adds:
+                return True
+            if booking_id in self._pending_removes or self._pending_clear:
+                return False
+        with _inner_call():
+            return self.inner.contains(booking_id)
+
+    def count(self):
+        self.flush()
+        with _inner_call():
+            return self.inner.count()
+
+    def remove_booking_id(self, booking_id):
+        self.remove_booking_ids([booking_id])
+
+    def remove_booking_ids(self, booking_ids):
+        with self._lock:
+            for booking_id in booking_ids:
+                self._pending_adds.pop(booking_id, None)
+                # The inner store may hold the ID from an earlier flush
+                self._pending_removes.add(booking_id)
+            self._mutated()
+
+    def clear(self):
+        with self._lock:
+            self._pending_adds.clear()
+            self._pending_removes.clear()
+            self._pending_clear = True
+            self._mutated()
+
+    def flush(self):
+        with self._lock, _inner_call():
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+            if self._pending_clear:
+                self.inner.clear()
+                self._pending_clear = False
+            if self._pending_removes:
+                self.inner.remove_booking_ids(list(self._pending_removes))
+                self._pending_removes.clear()
+            if self._pending_adds:
+                self.inner.store_records(list(self._pending_adds.values()))
+                self._pending_adds.clear()
+
+    def close(self):
+        self.flush()
+        atexit.unregister(self.flush)
+        _instances.discard(self)
+        with _inner_call():
+            self.inner.close()
+
+    def _pending_count(self):
+        return len(self._pending_adds) + len(self._pending_removes)
+
+    def _mutated(self):
+        """Flush once max_pending is reached, otherwise arm the flush timer"""
+        if self._pending_count() >= self.max_pending:
+            self.flush()
+        elif self._timer is None:
+            self._timer = threading.Timer(self.flush_interval, self.flush)
+            self._timer.daemon = True
+            self._timer.start()
@@ -0,0 +1,13 @@
+import pytest
+
+from helpers.self_healing import SelfHealing
+
+
+@pytest.fixture
+def self_healing_path(tmp_path, monkeypatch):
+    """Point SelfHealing at a store in a temporary directory"""
+    path = tmp_path / "test_data.json"
+    monkeypatch.setattr(SelfHealing, "DATA_FILE", str(path))
+    monkeypatch.setattr(SelfHealing, "SHARD_BY_WORKER", False)
+    yield path
+    SelfHealing.flush()
@@ -0,0 +1,334 @@
+import gc
+import itertools
+import json
+import random
+import threading
+import time
+from types import SimpleNamespace
+import weakref
+
+import pytest
+import requests
+
+from helpers import response_cache
+from helpers.api_client import BookingAPIClient
+from helpers.self_healing import SelfHealing
+
+
+def make_response(status_code=200, body=None, headers=None):
+    response = requests.Response()
+    response.status_code = status_code
+    response.headers.update(headers or {})
+    response._content = json.dumps(body).encode() if body is not None else b""
+    return response
+
+
+class StreamedResponse:
+    """Stand-in for a streamed response that delivers body in given chunks"""
+
+    def __init__(self, body, chunk_sizes):
+        self.body = body
+        self.chunk_sizes = chunk_sizes
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        return False
+
+    def raise_for_status(self):
+        pass
+
+    def iter_content(self, chunk_size):
+        position = 0
+        sizes = iter(self.chunk_sizes)
+        while position < len(self.body):
+            size = next(sizes)
+            yield self.body[position : position + size]
+            position += size
+
+
+@pytest.fixture
+def client(self_healing_path):
+    client = BookingAPIClient(auto_refresh=False, cache_ttl=60)
+    yield client
+    client.close()
+
+
+@pytest.mark.parametrize("seed", range(20))
+def test_iter_booking_ids_across_chunk_boundaries(client, monkeypatch, seed):
+    rng = random.Random(seed)
+    ids = [rng.randrange(1, 10 ** rng.randint(1, 9)) for _ in range(500)]
+    body = json.dumps([{"bookingid": booking_id} for booking_id in ids])
+    if seed % 2:
+        body = body.replace(":", " :  ")
+    chunk_sizes = [rng.randint(1, 1000) for _ in range(len(body))]
+    monkeypatch.setattr(
+        client.session,
+        "get",
+        lambda url, stream: StreamedResponse(body.encode(), chunk_sizes),
+    )
+
+    assert list(client.iter_booking_ids()) == ids
+
+
+def test_create_booking_keeps_cached_single_reads(client, monkeypatch):
+    gets = []
+
+    def fake_get(url, headers=None):
+        gets.append(url)
+        if url.endswith("/booking"):
+            return make_response(body=[{"bookingid": 1}])
+        return make_response(body={"firstname": "John"})
+
+    monkeypatch.setattr(client.session, "get", fake_get)
+    monkeypatch.setattr(
+        client.session,
+        "post",
+        lambda url, **kwargs: make_response(body={"bookingid": 2}),
+    )
+
+    client.get_booking(1)
+    client.get_all_bookings()
+    client.create_booking({"firstname": "Jane"})
+    client.get_booking(1)
+    client.get_all_bookings()
+
+    assert gets.count(f"{client.base_url}/booking/1") == 1
+    assert gets.count(f"{client.base_url}/booking") == 2
+
+
+def fake_create(counter):
+    def post(url, json=None, data=None, headers=None):
+        booking_id = next(counter)
+        return make_response(body={"bookingid": booking_id})
+
+    return post
+
+
+def test_create_bookings_stores_ids_in_one_write(client, monkeypatch):
+    monkeypatch.setattr(client.session, "post", fake_create(itertools.count(1)))
+    writes = []
+    monkeypatch.setattr(SelfHealing, "store_booking_ids", writes.append)
+
+    results = client.create_bookings([{"firstname": "x"}] * 50, max_workers=4)
+
+    assert all(result.ok for result in results)
+    assert len(writes) == 1
+    assert sorted(writes[0]) == list(range(1, 51))
+
+
+def test_replay_bookings_stores_ids_in_batches(client, monkeypatch):
+    monkeypatch.setattr(client.session, "post", fake_create(itertools.count(1)))
+    monkeypatch.setattr(client, "STORE_BATCH_SIZE", 20)
+    writes = []
+    monkeypatch.setattr(SelfHealing, "store_booking_ids", writes.append)
+
+    results = list(client.replay_bookings([b'{"firstname":"x"}'] * 50, max_workers=4))
+
+    assert len(results) == 50
+    assert [len(batch) for batch in writes] == [20, 20, 10]
+    assert sorted(sum(writes, [])) == list(range(1, 51))
+
+
+def fake_auth(url, json=None):
+    return make_response(body={"token": "abc123"})
+
+
+def test_unclosed_client_is_collected_with_refresh_pending(self_healing_path):
+    client = BookingAPIClient(auto_refresh=True)
+    client.session.post = fake_auth
+    client.authenticate()
+    timer = client._refresh_timer
+    assert timer.is_alive()
+
+    client_ref = weakref.ref(client)
+    del client
+    gc.collect()
+
+    assert client_ref() is None
+    timer.join(timeout=5)
+    assert not timer.is_alive()
+
+
+def test_context_manager_cancels_refresh(self_healing_path):
+    with BookingAPIClient(auto_refresh=True) as client:
+        client.session.post = fake_auth
+        client.authenticate()
+        timer = client._refresh_timer
+
+    timer.join(timeout=5)
+    assert not timer.is_alive()
+    assert client._refresh_timer is None
+
+
+def test_racing_writers_share_one_auth_request(client, monkeypatch):
+    auth_calls = []
+
+    def slow_auth(url, json=None):
+        auth_calls.append(url)
+        # Hold the request open so the writers pile up behind it
+        time.sleep(0.05)
+        return fake_auth(url, json)
+
+    monkeypatch.setattr(client.session, "post", slow_auth)
+    monkeypatch.setattr(client.session, "patch", lambda url, **kwargs: make_response())
+    barrier = threading.Barrier(50)
+    responses = []
+
+    def writer(booking_id):
+        barrier.wait()
+        responses.append(client.partial_update_booking(booking_id, {"totalprice": 1}))
+
+    threads = [threading.Thread(target=writer, args=(i,)) for i in range(50)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(responses) == 50
+    assert len(auth_calls) == 1
+
+
+def test_refresh_finishing_after_close_does_not_rearm(self_healing_path):
+    client = BookingAPIClient(auto_refresh=True)
+    client.session.post = fake_auth
+    client.authenticate()
+
+    in_auth = threading.Event()
+    release = threading.Event()
+
+    def blocked_auth(url, json=None):
+        in_auth.set()
+        release.wait(5)
+        return fake_auth(url, json)
+
+    client.session.post = blocked_auth
+    refresh = threading.Thread(target=client._refresh_token)
+    refresh.start()
+    assert in_auth.wait(5)
+    closing = threading.Thread(target=client.close)
+    closing.start()
+    release.set()
+    refresh.join()
+    closing.join()
+    assert client._refresh_timer is None
+
+    # A timer that fired just as close() ran must not re-arm either
+    client.session.post = fake_auth
+    client._refresh_token()
+    assert client._refresh_timer is None
+
+
+class CachingServer:
+    """Stand-in for GET endpoints that honour conditional requests"""
+
+    ETAG = '"v1"'
+    LAST_MODIFIED = "Thu, 01 Jan 2026 00:00:00 GMT"
+
+    def __init__(self):
+        self.requests = []
+
+    def get(self, url, headers=None):
+        self.requests.append((url, headers or {}))
+        if headers and headers.get("If-None-Match") == self.ETAG:
+            return make_response(304)
+        validators = {"ETag": self.ETAG, "Last-Modified": self.LAST_MODIFIED}
+        return make_response(body={"url": url}, headers=validators)
+
+    def urls(self):
+        return [url for url, _ in self.requests]
+
+
+@pytest.fixture
+def server(client, monkeypatch):
+    server = CachingServer()
+    monkeypatch.setattr(client.session, "get", server.get)
+    return server
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = SimpleNamespace(now=0.0)
+    monkeypatch.setattr(
+        response_cache, "time", SimpleNamespace(monotonic=lambda: clock.now)
+    )
+    return clock
+
+
+def test_cache_revalidates_after_ttl_and_304_restarts_it(client, server, clock):
+    url = f"{client.base_url}/booking/1"
+    first = client.get_booking(1)
+    clock.now = 59
+    assert client.get_booking(1) is first
+    assert len(server.requests) == 1
+
+    clock.now = 61
+    assert client.get_booking(1) is first
+    assert server.requests[-1] == (
+        url,
+        {
+            "If-None-Match": CachingServer.ETAG,
+            "If-Modified-Since": CachingServer.LAST_MODIFIED,
+        },
+    )
+
+    # The 304 restarted the TTL
+    clock.now = 120
+    client.get_booking(1)
+    assert len(server.requests) == 2
+    clock.now = 122
+    client.get_booking(1)
+    assert len(server.requests) == 3
+
+
+def test_cache_evicts_least_recently_used(self_healing_path, monkeypatch):
+    client = BookingAPIClient(auto_refresh=False, cache_ttl=60, cache_maxsize=2)
+    server = CachingServer()
+    monkeypatch.setattr(client.session, "get", server.get)
+    try:
+        for booking_id in (1, 2, 1, 3, 1, 2):
+            client.get_booking(booking_id)
+    finally:
+        client.close()
+
+    # 2 was least recently used when 3 arrived, so only it is fetched again
+    assert [url.rsplit("/", 1)[1] for url in server.urls()] == ["1", "2", "3", "2"]
+
+
+@pytest.mark.parametrize(
+    "write, method, status_code",
+    [
+        ("update_booking", "put", 200),
+        ("partial_update_booking", "patch", 200),
+        ("delete_booking", "delete", 201),
+    ],
+)
+def test_writes_invalidate_cached_reads(
+    client, server, monkeypatch, write, method, status_code
+):
+    monkeypatch.setattr(client.session, "post", fake_auth)
+    monkeypatch.setattr(
+        client.session, method, lambda url, **kwargs: make_response(status_code)
+    )
+    reads = [
+        lambda: client.get_booking(1),
+        lambda: client.get_booking(2),
+        lambda: client.get_all_bookings(),
+        lambda: client.get_all_bookings(firstname="Jim"),
+    ]
+    for read in reads:
+        read()
+
+    args = (1,) if write == "delete_booking" else (1, {"firstname": "Jim"})
+    getattr(client, write)(*args)
+    server.requests.clear()
+    for read in reads:
+        read()
+
+    # Only the unrelated single read is still served from the cache
+    assert server.urls() == [
+        f"{client.base_url}/booking/1",
+        f"{client.base_url}/booking",
+        f"{client.base_url}/booking?firstname=Jim",
+    ]
@@ -0,0 +1,103 @@
+import asyncio
+import threading
+
+import httpx
+
+from helpers import async_api_client
+from helpers.async_api_client import AsyncBookingAPIClient
+from helpers.self_healing import SelfHealing
+
+
+async def mock_client(handler, **kwargs):
+    """Async client whose requests are answered by handler instead of the network"""
+    client = AsyncBookingAPIClient(**kwargs)
+    await client.client.aclose()
+    client.client = httpx.AsyncClient(
+        base_url=client.base_url, transport=httpx.MockTransport(handler)
+    )
+    return client
+
+
+def test_concurrent_writers_share_one_auth_request(self_healing_path):
+    auth_calls = []
+
+    async def handler(request):
+        if request.url.path == "/auth":
+            auth_calls.append(request)
+            # Hold the request open so the writers pile up behind it
+            await asyncio.sleep(0.05)
+            return httpx.Response(200, json={"token": "abc123"})
+        assert request.headers["Cookie"] == "token=abc123"
+        return httpx.Response(200, json={})
+
+    async def run():
+        async with await mock_client(handler) as client:
+            return await asyncio.gather(
+                *(
+                    client.partial_update_booking(i, {"totalprice": i})
+                    for i in range(50)
+                )
+            )
+
+    responses = asyncio.run(run())
+
+    assert all(response.status_code == 200 for response in responses)
+    assert len(auth_calls) == 1
+
+
+def test_5xx_responses_are_retried_with_exponential_backoff(
+    self_healing_path, monkeypatch
+):
+    statuses = iter([503, 502, 500, 200])
+    delays = []
+
+    async def fake_sleep(delay):
+        delays.append(delay)
+
+    monkeypatch.setattr(async_api_client.asyncio, "sleep", fake_sleep)
+
+    async def run(retries):
+        client = await mock_client(
+            lambda request: httpx.Response(next(statuses)),
+            retries=retries,
+            backoff_factor=0.5,
+        )
+        async with client:
+            return await client.health_check()
+
+    assert asyncio.run(run(retries=3)).status_code == 200
+    assert delays == [0.5, 1.0, 2.0]
+
+    statuses = iter([504, 504, 504])
+    delays.clear()
+    assert asyncio.run(run(retries=2)).status_code == 504
+    assert delays == [0.5, 1.0]
+
+
+def test_bytes_body_is_sent_as_is(self_healing_path, monkeypatch):
+    body = b'{"firstname": "Jim", "totalprice": 111}'
+    sent = []
+    storing_threads = []
+
+    def handler(request):
+        sent.append(request)
+        return httpx.Response(200, json={"bookingid": 7})
+
+    store_booking_id = SelfHealing.store_booking_id
+
+    def record_thread(booking_id):
+        storing_threads.append(threading.current_thread())
+        store_booking_id(booking_id)
+
+    monkeypatch.setattr(SelfHealing, "store_booking_id", record_thread)
+
+    async def run():
+        async with await mock_client(handler) as client:
+            return await client.create_booking(body)
+
+    assert asyncio.run(run()).status_code == 200
+    assert sent[0].content == body
+    assert sent[0].headers["Content-Type"] == "application/json"
+    assert SelfHealing.contains(7)
+    # Storage writes run in a worker thread, not on the event loop
+    assert storing_threads and threading.main_thread() not in storing_threads
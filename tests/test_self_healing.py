@@ -0,0 +1,260 @@
+import json
+import multiprocessing
+import os
+import random
+import signal
+from pathlib import Path
+
+import pytest
+
+from helpers.self_healing import SelfHealing
+from helpers.storage import (
+    JournalBackend,
+    JsonFileBackend,
+    MmapBackend,
+    WriteBackBackend,
+)
+from helpers.storage import write_back
+from helpers.storage.base import BookingRecord
+from helpers.storage.mmap_backend import RECORD
+
+PROCESSES = 8
+IDS_PER_PROCESS = 200
+
+
+def store_ids(data_file, backend, start):
+    """Worker process: store a disjoint range of IDs through SelfHealing"""
+    SelfHealing.DATA_FILE = data_file
+    SelfHealing.BACKEND = backend
+    SelfHealing.WRITE_BACK = False
+    SelfHealing.SHARD_BY_WORKER = False
+    for booking_id in range(start, start + IDS_PER_PROCESS):
+        SelfHealing.store_booking_id(booking_id)
+
+
+@pytest.mark.parametrize("backend", ["json", "journal", "sqlite", "mmap"])
+def test_concurrent_processes_lose_no_ids(self_healing_path, monkeypatch, backend):
+    monkeypatch.setattr(SelfHealing, "BACKEND", backend)
+    monkeypatch.setattr(SelfHealing, "WRITE_BACK", False)
+    context = multiprocessing.get_context("spawn")
+    processes = [
+        context.Process(
+            target=store_ids,
+            args=(str(self_healing_path), backend, worker * IDS_PER_PROCESS),
+        )
+        for worker in range(PROCESSES)
+    ]
+    for process in processes:
+        process.start()
+    for process in processes:
+        process.join(timeout=120)
+        assert process.exitcode == 0
+
+    expected = set(range(PROCESSES * IDS_PER_PROCESS))
+    assert set(SelfHealing.get_booking_ids()) == expected
+    assert SelfHealing.count() == len(expected)
+
+
+def test_write_back_removes_id_flushed_then_stored_again(tmp_path):
+    backend = WriteBackBackend(JsonFileBackend(str(tmp_path / "test_data.json")))
+    try:
+        backend.store_booking_id(5)
+        backend.flush()
+        backend.store_booking_id(5)
+        backend.remove_booking_id(5)
+        backend.flush()
+        assert backend.get_booking_ids() == []
+    finally:
+        backend.close()
+
+
+def test_sigterm_during_flush_waits_for_it_to_finish(tmp_path, monkeypatch):
+    inner = JsonFileBackend(str(tmp_path / "test_data.json"))
+    backend = WriteBackBackend(inner)
+    assert write_back.install_sigterm_handler()
+    terminated = []
+    monkeypatch.setattr(
+        write_back,
+        "_previous_sigterm",
+        lambda signum, frame: terminated.append(inner.get_booking_ids()),
+    )
+    save_data = inner._save_data
+
+    def save_then_signal(data):
+        # Delivered while the flush holds the inner backend's locks
+        save_data(data)
+        signal.raise_signal(signal.SIGTERM)
+
+    monkeypatch.setattr(inner, "_save_data", save_then_signal)
+    try:
+        backend.store_records([BookingRecord.new(1), BookingRecord.new(2)])
+        backend.flush()
+        assert terminated == [[1, 2]]
+    finally:
+        monkeypatch.undo()
+        backend.close()
+
+
+def test_worker_shards_share_token_and_merge_ids(self_healing_path, monkeypatch):
+    monkeypatch.setattr(SelfHealing, "WRITE_BACK", False)
+    monkeypatch.setattr(SelfHealing, "SHARD_BY_WORKER", True)
+    for worker, booking_id in (("gw0", 1), ("gw1", 2)):
+        monkeypatch.setenv("PYTEST_XDIST_WORKER", worker)
+        SelfHealing.store_booking_id(booking_id)
+        SelfHealing.store_token(f"token-{worker}")
+        assert SelfHealing.get_booking_ids() == [booking_id]
+
+    # Tokens are shared between workers, booking IDs are not
+    assert SelfHealing.get_token() == "token-gw1"
+
+    monkeypatch.delenv("PYTEST_XDIST_WORKER")
+    assert SelfHealing.merge_worker_shards() == 2
+    assert sorted(SelfHealing.get_booking_ids()) == [1, 2]
+    assert list(self_healing_path.parent.glob("*.gw*")) == []
+
+
+def test_json_booking_table_matches_reference_model(tmp_path):
+    rng = random.Random(0)
+    backend = JsonFileBackend(str(tmp_path / "test_data.json"))
+    model = {}
+    for step in range(300):
+        if rng.random() < 0.6:
+            records = [
+                BookingRecord(
+                    rng.randrange(200),
+                    rng.choice(["run-a", "run-b", None]),
+                    rng.choice(["master", "gw0"]),
+                    float(rng.randrange(3)),
+                )
+                for _ in range(rng.randint(1, 5))
+            ]
+            backend.store_records(records)
+            for record in records:
+                model.setdefault(record.booking_id, record)
+        else:
+            booking_ids = [rng.randrange(200) for _ in range(rng.randint(1, 5))]
+            backend.remove_booking_ids(booking_ids)
+            for booking_id in booking_ids:
+                model.pop(booking_id, None)
+        assert backend.get_records() == list(model.values())
+
+    assert backend.count() == len(model)
+    assert all(backend.contains(booking_id) for booking_id in model)
+    stale = backend.get_stale_booking_ids(-10, "run-a")
+    assert stale == [r.booking_id for r in model.values() if r.run_id != "run-a"]
+
+
+def test_journal_skips_torn_final_record(tmp_path):
+    backend = JournalBackend(str(tmp_path / "test_data.json"))
+    backend.store_booking_ids([1, 2])
+    with open(backend.journal_path, "ab") as f:
+        f.write(b'{"op": "remove", "i')
+
+    assert JournalBackend(backend.path).get_booking_ids() == [1, 2]
+    # The next append terminates the torn record instead of joining it
+    backend.store_booking_id(3)
+    assert backend.get_booking_ids() == [1, 2, 3]
+
+
+def test_journal_compacts_at_compact_bytes(tmp_path):
+    backend = JournalBackend(str(tmp_path / "test_data.json"), compact_bytes=512)
+    for booking_id in range(100):
+        backend.store_booking_id(booking_id)
+        assert os.path.getsize(backend.journal_path) < backend.compact_bytes
+    backend.remove_booking_ids(range(0, 100, 2))
+
+    assert os.path.getsize(backend.path) > 0
+    assert backend.get_booking_ids() == list(range(1, 100, 2))
+
+
+def test_journal_replays_cleanly_after_crash_before_truncate(tmp_path):
+    backend = JournalBackend(str(tmp_path / "test_data.json"))
+    backend.store_booking_ids([1, 2])
+    backend.clear()
+    backend.store_booking_ids([3, 4])
+    backend.store_token("abc")
+    backend.remove_booking_id(3)
+    journal = Path(backend.journal_path).read_bytes()
+    assert (backend.get_booking_ids(), backend.get_token()) == ([4], "abc")
+
+    # Crash after the snapshot was replaced but before the journal was truncated
+    backend.compact()
+    Path(backend.journal_path).write_bytes(journal)
+
+    recovered = JournalBackend(backend.path)
+    assert (recovered.get_booking_ids(), recovered.get_token()) == ([4], "abc")
+
+
+def test_mmap_store_matches_reference_model(tmp_path):
+    rng = random.Random(0)
+    path = tmp_path / "test_data.json.ids"
+    backend = MmapBackend(str(path))
+    model = {}
+    for step in range(300):
+        action = rng.random()
+        if action < 0.5:
+            # IDs above the current maximum append, lower ones are spliced in
+            top = max(model, default=0)
+            records = [
+                BookingRecord(
+                    rng.randrange(top + 20) if rng.random() < 0.5 else top + i + 1,
+                    created_at=float(rng.randrange(3)),
+                )
+                for i in range(rng.randint(1, 5))
+            ]
+            backend.store_records(records)
+            for record in records:
+                model.setdefault(record.booking_id, record.created_at)
+        elif action < 0.9:
+            booking_ids = rng.sample(sorted(model) or [0], min(len(model), 3))
+            booking_ids.append(rng.randrange(200))
+            backend.remove_booking_ids(booking_ids)
+            for booking_id in booking_ids:
+                model.pop(booking_id, None)
+        elif path.exists() and not path.stat().st_size % RECORD.size:
+            # A crash mid-append leaves a partial record at the end
+            with open(path, "ab") as f:
+                f.write(bytes(rng.randrange(1, RECORD.size)))
+        assert list(backend.iter_booking_ids()) == sorted(model)
+        assert [(r.booking_id, r.created_at) for r in backend.get_records()] == sorted(
+            model.items()
+        )
+
+    assert backend.count() == len(model)
+    assert all(backend.contains(booking_id) for booking_id in model)
+
+
+def test_mmap_iteration_survives_removing_while_iterating(tmp_path):
+    backend = MmapBackend(str(tmp_path / "test_data.json.ids"))
+    backend.store_records([BookingRecord.new(booking_id) for booking_id in range(50)])
+
+    seen = []
+    for booking_id in backend.iter_booking_ids():
+        seen.append(booking_id)
+        backend.remove_booking_id(booking_id)
+
+    assert seen == list(range(50))
+    assert backend.count() == 0
+
+
+def test_json_backend_reads_older_layouts(tmp_path):
+    path = tmp_path / "test_data.json"
+    path.write_text(
+        json.dumps(
+            {
+                "token": "abc",
+                "booking_ids": [3],
+                "bookings": [[1, "run", "gw0", 5.0], [2, None, None, 0.0]],
+            }
+        )
+    )
+    backend = JsonFileBackend(str(path))
+
+    assert backend.get_records() == [
+        BookingRecord(1, "run", "gw0", 5),
+        BookingRecord(2),
+        BookingRecord(3),
+    ]
+    assert backend.get_token() == "abc"
+    backend.remove_booking_id(1)
+    assert backend.get_booking_ids() == [2, 3]